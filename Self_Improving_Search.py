@@ -6,7 +6,8 @@ from colorama import Fore, Style
 import logging
 import sys
 from io import StringIO
-from web_scraper import get_web_content, can_fetch
+from web_scraper import iter_web_pages, can_fetch, prefetch_robots, is_healthy
+from search_cache import get_search_client
 from llm_config import get_llm_config
 from llm_response_parser import UltimateLLMResponseParser
 from llm_wrapper import LLMWrapper
@@ -103,7 +104,7 @@ class EnhancedSelfImprovingSearch:
 
                 print(Fore.MAGENTA + "⚙️ Scraping selected pages..." + Style.RESET_ALL)
                 # Scraping is done without OutputRedirector to ensure messages are visible
-                scraped_content = self.scrape_content(selected_urls)
+                scraped_content = self.scrape_content(selected_urls, user_query)
 
                 if not scraped_content:
                     print(f"{Fore.RED}Failed to scrape content. Retrying...{Style.RESET_ALL}")
@@ -159,7 +160,7 @@ Decision: [ONLY 'answer' if content is sufficient, or 'refine' if more informati
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response_text = self.llm.generate(prompt, max_tokens=200, stop=None)
+                response_text = self.llm.generate(prompt, max_tokens=200, stop=None, use_cache=attempt == 0)
                 evaluation, decision = self.parse_evaluation_response(response_text)
                 if decision in ['answer', 'refine']:
                     return evaluation, decision
@@ -201,7 +202,8 @@ Do not provide any additional information or explanation.
         max_retries = 3
         for retry in range(max_retries):
             with OutputRedirector() as output:
-                response_text = self.llm.generate(prompt, max_tokens=50, stop=None)
+                # Refinement attempts and retries need a fresh query, not the cached one
+                response_text = self.llm.generate(prompt, max_tokens=50, stop=None, use_cache=attempt == 0 and retry == 0)
             llm_output = output.getvalue()
             logger.info(f"LLM Output in formulate_query:\n{llm_output}")
             query, time_range = self.parse_query_response(response_text)
@@ -241,21 +243,16 @@ Do not provide any additional information or explanation.
         if not query:
             return []
 
-        from duckduckgo_search import DDGS
-
-        with DDGS() as ddgs:
-            try:
-                with OutputRedirector() as output:
-                    if time_range and time_range != 'none':
-                        results = list(ddgs.text(query, timelimit=time_range, max_results=10))
-                    else:
-                        results = list(ddgs.text(query, max_results=10))
-                ddg_output = output.getvalue()
-                logger.info(f"DDG Output in perform_search:\n{ddg_output}")
-                return [{'number': i+1, **result} for i, result in enumerate(results)]
-            except Exception as e:
-                print(f"{Fore.RED}Search error: {str(e)}{Style.RESET_ALL}")
-                return []
+        # Repeated (query, time_range) pairs are answered from the search cache
+        try:
+            with OutputRedirector() as output:
+                results = get_search_client().search(query, time_range)
+            ddg_output = output.getvalue()
+            logger.info(f"DDG Output in perform_search:\n{ddg_output}")
+            return [{'number': i+1, **result} for i, result in enumerate(results)]
+        except Exception as e:
+            print(f"{Fore.RED}Search error: {str(e)}{Style.RESET_ALL}")
+            return []
 
     def display_search_results(self, results: List[Dict]) -> None:
         """Display search results with minimal output"""
@@ -272,6 +269,9 @@ Do not provide any additional information or explanation.
             logger.error(f"Error displaying search results: {str(e)}")
 
     def select_relevant_pages(self, search_results: List[Dict], user_query: str) -> List[str]:
+        search_results = self.prefer_healthy_results(search_results)
+        # Fetch robots.txt for the candidates while the LLM makes its selection
+        prefetch_robots([result['href'] for result in search_results])
         prompt = f"""
 Given the following search results for the user's question: "{user_query}"
 Select the 2 most relevant results to scrape and analyze. Explain your reasoning for each selection.
@@ -293,7 +293,7 @@ Reasoning: [Your reasoning for the selections]
         max_retries = 3
         for retry in range(max_retries):
             with OutputRedirector() as output:
-                response_text = self.llm.generate(prompt, max_tokens=200, stop=None)
+                response_text = self.llm.generate(prompt, max_tokens=200, stop=None, use_cache=retry == 0)
             llm_output = output.getvalue()
             logger.info(f"LLM Output in select_relevant_pages:\n{llm_output}")
 
@@ -313,6 +313,14 @@ Reasoning: [Your reasoning for the selections]
         allowed_urls = [result['href'] for result in search_results if can_fetch(result['href'])][:2]
         return allowed_urls
 
+    def prefer_healthy_results(self, search_results: List[Dict]) -> List[Dict]:
+        """Drop results on domains that keep failing, as long as two results remain to choose from"""
+        healthy = [result for result in search_results if is_healthy(result['href'])]
+        if len(healthy) == len(search_results) or len(healthy) < 2:
+            return search_results
+        logger.info(f"Skipping {len(search_results) - len(healthy)} results on failing domains")
+        return [{**result, 'number': i + 1} for i, result in enumerate(healthy)]
+
     def parse_page_selection_response(self, response: str) -> Dict[str, Union[List[int], str]]:
         lines = response.strip().split('\n')
         parsed = {}
@@ -339,25 +347,38 @@ Reasoning: [Your reasoning for the selections]
             formatted_results.append(formatted_result)
         return "\n".join(formatted_results)
 
-    def scrape_content(self, urls: List[str]) -> Dict[str, str]:
+    def scrape_content(self, urls: List[str], query: str = None) -> Dict[str, str]:
+        return {url: page['content'] for url, page in self.scrape_pages(urls, query).items()}
+
+    def scrape_pages(self, urls: List[str], query: str = None, count_tokens=None) -> Dict[str, Dict]:
+        """Scrape urls and return the full extracted page (title, content, links, anchors) per url.
+
+        With a query, each page's content holds its passages most relevant to it,
+        with tokens counted by count_tokens.
+        """
         scraped_content = {}
+        allowed_urls = []
         blocked_urls = []
         for url in urls:
-            robots_allowed = can_fetch(url)
-            if robots_allowed:
-                content = get_web_content([url])
-                if content:
-                    scraped_content.update(content)
-                    print(Fore.YELLOW + f"Successfully scraped: {url}" + Style.RESET_ALL)
-                    logger.info(f"Successfully scraped: {url}")
-                else:
-                    print(Fore.RED + f"Robots.txt disallows scraping of {url}" + Style.RESET_ALL)
-                    logger.warning(f"Robots.txt disallows scraping of {url}")
+            if can_fetch(url):
+                allowed_urls.append(url)
             else:
                 blocked_urls.append(url)
                 print(Fore.RED + f"Warning: Robots.txt disallows scraping of {url}" + Style.RESET_ALL)
                 logger.warning(f"Robots.txt disallows scraping of {url}")
 
+        # Fetch the whole selection at once and report each page as it completes
+        for url, page in iter_web_pages(allowed_urls, query=query, count_tokens=count_tokens):
+            if page['content']:
+                scraped_content[url] = page
+                print(Fore.YELLOW + f"Successfully scraped: {url}" + Style.RESET_ALL)
+                logger.info(f"Successfully scraped: {url}")
+
+        for url in allowed_urls:
+            if url not in scraped_content:
+                print(Fore.RED + f"Failed to scrape {url}" + Style.RESET_ALL)
+                logger.warning(f"Failed to scrape {url}")
+
         print(Fore.CYAN + f"Scraped content received for {len(scraped_content)} URLs" + Style.RESET_ALL)
         logger.info(f"Scraped content received for {len(scraped_content)} URLs")
 
@@ -206,15 +206,11 @@ def handle_research_mode(research_manager, query):
             except KeyboardInterrupt:
                 break
 
-        # Get final summary first
+        # Leaves the research UI and streams the summary to the main terminal;
+        # only a message in place of a summary comes back to be printed
         summary = research_manager.terminate_research()
-
-        # Ensure research UI is fully cleaned up
-        research_manager._cleanup_research_ui()
-
-        # Now in main terminal, show summary
-        print(f"\n{Fore.GREEN}Research Summary:{Style.RESET_ALL}")
-        print(summary)
+        if summary:
+            print(summary)
 
         # Only NOW start conversation mode if we have a valid summary
         if research_manager.research_complete and research_manager.research_summary:
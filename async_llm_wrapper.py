@@ -0,0 +1,136 @@
+import asyncio
+from llm_scheduler import PRIORITY_BACKGROUND
+
+class AsyncLLMWrapper:
+    """Asyncio counterpart of LLMWrapper with bounded request concurrency.
+
+    Wraps an existing LLMWrapper so configuration, credentials and request
+    building are shared. Clients are bound to the running event loop, so use
+    it as an async context manager:
+
+        async with AsyncLLMWrapper(llm) as async_llm:
+            responses = await async_llm.generate_many(prompts)
+    """
+    def __init__(self, llm, max_concurrency=None):
+        self.llm = llm
+        self.llm_config = llm.llm_config
+        self.llm_type = llm.llm_type
+        if self.llm_type == 'llama_cpp':
+            # A single in-process model can only evaluate one prompt at a time
+            self.max_concurrency = 1
+        else:
+            self.max_concurrency = max_concurrency or self.llm_config.get('max_concurrency', 4)
+        self.semaphore = None
+        self.http_session = None
+        self.client = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.llm_type == 'ollama':
+            # Imported here so other backends do not pay for aiohttp at startup
+            import aiohttp
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.llm_config.get('connect_timeout', 10),
+                sock_read=self.llm_config.get('read_timeout', 600)
+            )
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.http_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        elif self.llm_type == 'openai':
+            self.client = self.llm.backend.AsyncOpenAI(api_key=self.llm.client.api_key, base_url=self.llm.client.base_url)
+        elif self.llm_type == 'anthropic':
+            self.client = self.llm.backend.AsyncAnthropic(api_key=self.llm.client.api_key, base_url=self.llm.client.base_url)
+        elif self.llm_type != 'llama_cpp':
+            raise ValueError(f"Unsupported LLM type: {self.llm_type}")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.http_session:
+            await self.http_session.close()
+            self.http_session = None
+        if self.client:
+            await self.client.close()
+            self.client = None
+
+    async def generate(self, prompt, **kwargs):
+        if self.llm_type == 'llama_cpp':
+            # LLMWrapper.generate already consults the response cache
+            async with self.semaphore:
+                return await asyncio.to_thread(self.llm.generate, prompt, **kwargs)
+
+        priority = kwargs.pop('priority', PRIORITY_BACKGROUND)
+        use_cache = kwargs.pop('use_cache', True)
+        cache_key = self.llm._cache_key(prompt, kwargs) if use_cache else None
+        if cache_key:
+            cached = self.llm.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with self.semaphore:
+            # Share the in-flight limit and priority queue with synchronous callers
+            await self._acquire_slot(priority)
+            try:
+                if self.llm_type == 'ollama':
+                    response = await self._ollama_generate(prompt, **kwargs)
+                elif self.llm_type == 'openai':
+                    response = await self._openai_generate(prompt, **kwargs)
+                elif self.llm_type == 'anthropic':
+                    response = await self._anthropic_generate(prompt, **kwargs)
+                else:
+                    raise ValueError(f"Unsupported LLM type: {self.llm_type}")
+            finally:
+                self.llm.scheduler.release()
+
+        if cache_key and response:
+            self.llm.cache.set(cache_key, response)
+        return response
+
+    async def _acquire_slot(self, priority):
+        """Wait for a scheduler slot in a worker thread without leaking it on cancellation"""
+        scheduler = self.llm.scheduler
+        acquiring = asyncio.ensure_future(asyncio.to_thread(scheduler.acquire, priority))
+
+        def release_if_granted(future):
+            if not future.cancelled() and future.exception() is None:
+                scheduler.release()
+
+        try:
+            # Shielded so a cancelled caller leaves the thread's acquire() running to completion
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The slot may be granted after the caller is gone; hand it straight back
+            acquiring.add_done_callback(release_if_granted)
+            raise
+
+    async def generate_many(self, prompts, **kwargs):
+        """Generate responses for independent prompts concurrently, in prompt order.
+
+        Failed prompts are returned as the exception instance instead of a string.
+        """
+        tasks = [self.generate(prompt, **kwargs) for prompt in prompts]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _ollama_generate(self, prompt, **kwargs):
+        url = f"{self.llm.base_url}/api/generate"
+        data = self.llm._ollama_request(prompt, kwargs)
+        data['stream'] = False
+        async with self.http_session.post(url, json=data) as response:
+            if response.status != 200:
+                raise Exception(f"Ollama API request failed with status {response.status}: {await response.text()}")
+            result = await response.json(content_type=None)
+        return result.get('response', '').strip()
+
+    async def _openai_generate(self, prompt, **kwargs):
+        try:
+            response = await self.client.chat.completions.create(**self.llm._openai_request(prompt, kwargs))
+            self.llm._record_openai_usage(response.usage)
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            raise Exception(f"OpenAI API request failed: {str(e)}")
+
+    async def _anthropic_generate(self, prompt, **kwargs):
+        try:
+            response = await self.client.messages.create(**self.llm._anthropic_request(prompt, kwargs))
+            self.llm._record_anthropic_usage(response.usage)
+            return response.content[0].text.strip()
+        except Exception as e:
+            raise Exception(f"Anthropic API request failed: {str(e)}")
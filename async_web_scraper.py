@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from urllib.parse import urlparse
+from llm_config import get_scraper_config
+from web_scraper import get_shared_scraper
+from page_cache import PageCache
+from host_health import HostHealth
+from parse_pipeline import get_parse_pipeline
+from page_stream import PageReader, is_accepted_content_type, CHUNK_BYTES
+
+logger = logging.getLogger(__name__)
+
+class AsyncWebScraper:
+    """Asyncio scraping engine with hundreds of requests in flight.
+
+    Shares robots.txt handling, per-domain rate limits and content extraction
+    with the shared WebScraper; only the fetching moves onto aiohttp. Sessions
+    are bound to the running event loop, so use it as an async context manager:
+
+        async with AsyncWebScraper() as scraper:
+            async for url, data in scraper.iter_scraped_pages(urls, page_deadline=20):
+                ...
+    """
+    def __init__(self, scraper=None, max_in_flight=200, max_connections_per_host=4):
+        self.scraper = scraper or get_shared_scraper()
+        self.max_in_flight = max_in_flight
+        self.max_connections_per_host = max_connections_per_host
+        self.aiohttp = None
+        self.session = None
+
+    async def __aenter__(self):
+        # Imported here so the threaded engine does not pay for aiohttp at startup
+        import aiohttp
+        self.aiohttp = aiohttp
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.max_connections_per_host)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"User-Agent": self.scraper.session.headers["User-Agent"]}
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def wait_for_rate_limit(self, domain, deadline):
+        """Sleep on the event loop until the domain has a token; False if that would pass the deadline"""
+        while True:
+            delay = self.scraper.rate_limiter.try_acquire(domain)
+            if delay == 0.0:
+                return True
+            if time.time() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+
+    async def scrape_page(self, url, deadline):
+        """Scrape a page, giving up once the absolute deadline (time.time()) passes"""
+        # A robots.txt miss is a blocking fetch; concurrent pages on one domain share it
+        if not await asyncio.to_thread(self.scraper.can_fetch, url):
+            logger.info(f"Robots.txt disallows scraping: {url}")
+            return None
+
+        page_cache = self.scraper.page_cache
+        # SQLite calls block, so the page cache is only used from worker threads
+        cached = await asyncio.to_thread(page_cache.lookup, url) if page_cache else None
+        if cached and cached['fresh']:
+            return cached['data']
+        headers = PageCache.conditional_headers(cached)
+
+        domain = urlparse(url).netloc
+        health = self.scraper.health
+        max_retries = self.scraper.max_retries
+        trial = False
+        try:
+            for attempt in range(max_retries):
+                permit = health.allow(domain)
+                if not permit:
+                    logger.info(f"Skipping {url}: {domain} is failing and its circuit is open")
+                    return None
+                trial = trial or permit == HostHealth.TRIAL
+                if not await self.wait_for_rate_limit(domain, deadline):
+                    logger.warning(f"Deadline reached waiting for the rate limit on {url}")
+                    return None
+                timeout = min(health.timeout_for(domain, self.scraper.timeout), deadline - time.time())
+                if timeout <= 0:
+                    logger.warning(f"Deadline reached before scraping {url}")
+                    return None
+                try:
+                    start = time.time()
+                    async with self.session.get(url, headers=headers,
+                                                timeout=self.aiohttp.ClientTimeout(total=timeout)) as response:
+                        self.scraper.record_response(domain, response.status, response.headers, time.time() - start)
+                        response.raise_for_status()
+                        if cached and response.status == 304:
+                            await asyncio.to_thread(page_cache.revalidated, url, response.headers.get('ETag'),
+                                                    response.headers.get('Last-Modified'))
+                            return cached['data']
+                        reader = await self.read_body(response, url, deadline)
+                        response_headers = response.headers
+                    if reader is None:
+                        return None
+                    html = reader.text()
+                    # Parsing is CPU-bound; keep it off the event loop
+                    pipeline = get_parse_pipeline()
+                    if pipeline:
+                        # submit() may block on back-pressure, so it also runs off the loop
+                        job = await asyncio.to_thread(pipeline.submit, html, url)
+                        data = (await asyncio.wrap_future(job))[0]
+                    else:
+                        data = await asyncio.to_thread(self.scraper.extract_content, html, url)
+                    await asyncio.to_thread(self.scraper.cache_page, url, data, response_headers,
+                                            stale=cached is not None, reader=reader)
+                    return data
+                except (self.aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status = getattr(e, 'status', None)
+                    if not self.scraper.should_retry(url, domain, status, e):
+                        return None
+                    logger.warning(f"Error scraping {url} (attempt {attempt + 1}/{max_retries}): {e!r}")
+                    backoff = 2 ** attempt  # Exponential backoff
+                    if attempt == max_retries - 1 or time.time() + backoff >= deadline:
+                        logger.error(f"Failed to scrape {url} after {attempt + 1} attempts")
+                        return None
+                    await asyncio.sleep(backoff)
+        finally:
+            if trial:
+                # Also covers extraction errors and cancellation of the task
+                health.release_trial(domain)
+
+    async def read_body(self, response, url, deadline):
+        """Stream the body under the same byte ceiling and content budget as WebScraper.read_body"""
+        content_type = response.headers.get('Content-Type', '')
+        if not is_accepted_content_type(content_type):
+            self.scraper.reject_content_type(url, content_type)
+            return None
+        reader = PageReader(content_type, self.scraper.max_page_bytes, self.scraper.content_budget)
+        async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+            if reader.feed(chunk):
+                break
+            if time.time() >= deadline:
+                reader.truncated = True
+                break
+        self.scraper.record_fetch(url, reader, response.headers)
+        return reader
+
+    async def _scrape(self, url, deadline):
+        try:
+            return url, await self.scrape_page(url, deadline)
+        except Exception as exc:
+            logger.error(f"{url} generated an exception: {exc}")
+            return url, None
+
+    async def iter_scraped_pages(self, urls, page_deadline, scrape_deadline=None):
+        """Scrape urls concurrently and yield (url, data) pairs as each page completes.
+
+        All pages start at once, so each gets page_deadline (capped by
+        scrape_deadline) seconds from now. Domains whose circuit is open are
+        skipped, and pages still in flight are cancelled when the caller
+        stops iterating.
+        """
+        urls = list(dict.fromkeys(urls))
+        health = self.scraper.health
+        for url in [url for url in urls if not health.is_healthy(urlparse(url).netloc)]:
+            logger.warning(f"Skipping {url}: its domain is failing and its circuit is open")
+            urls.remove(url)
+        deadline = time.time() + min(page_deadline, scrape_deadline or page_deadline)
+        tasks = [asyncio.ensure_future(self._scrape(url, deadline)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, data = await next_done
+                if data:
+                    logger.info(f"Successfully scraped: {url}")
+                    yield url, data
+                else:
+                    logger.warning(f"Failed to scrape: {url}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+async def _iter_scraped_pages(urls, max_in_flight, page_deadline, scrape_deadline):
+    config = get_scraper_config()
+    async with AsyncWebScraper(
+        max_in_flight=max_in_flight,
+        max_connections_per_host=config.get('max_connections_per_host', 4)
+    ) as scraper:
+        async for url, data in scraper.iter_scraped_pages(urls, page_deadline, scrape_deadline):
+            yield url, data
+
+def iter_scraped_pages(urls, max_in_flight=None, page_deadline=None, scrape_deadline=None):
+    """Synchronous iterator over the asyncio engine, yielding (url, data) pairs as pages complete"""
+    config = get_scraper_config()
+    max_in_flight = max_in_flight or config.get('async_max_in_flight', 200)
+    page_deadline = page_deadline or config.get('page_deadline', 20)
+    scrape_deadline = scrape_deadline or config.get('scrape_deadline', 30)
+    urls = list(urls)
+    if not urls:
+        return
+
+    loop = asyncio.new_event_loop()
+    pages = _iter_scraped_pages(urls, max_in_flight, page_deadline, scrape_deadline)
+    try:
+        while True:
+            try:
+                page = loop.run_until_complete(pages.__anext__())
+            except StopAsyncIteration:
+                break
+            yield page
+    finally:
+        # Cancels whatever is still in flight if the caller stopped early
+        loop.run_until_complete(pages.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+def scrape_multiple_pages(urls, max_in_flight=None, page_deadline=None):
+    return dict(iter_scraped_pages(urls, max_in_flight=max_in_flight, page_deadline=page_deadline))
+
+def iter_web_content(urls, page_deadline=None):
+    """Yield (url, content) pairs for urls as soon as each page has been scraped"""
+    for url, data in iter_scraped_pages(urls, page_deadline=page_deadline):
+        yield url, data['content']
+
+def get_web_content(urls, page_deadline=None):
+    return dict(iter_web_content(urls, page_deadline=page_deadline))
@@ -0,0 +1,81 @@
+import re
+import time
+
+class SimHashIndex:
+    """Near-duplicate detection over scraped page text.
+
+    Each page gets a 64-bit SimHash over its word shingles; pages whose
+    fingerprints differ in at most max_distance bits are near-duplicates.
+    Fingerprints are split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits must agree on at least one whole band, so a
+    lookup only compares pages that share a band bucket instead of every
+    page in the index. Fingerprints use Python's per-process string hash, so
+    the index lives in memory for one research session.
+    """
+    BITS = 64
+    MASK = (1 << 64) - 1
+
+    def __init__(self, max_distance=6, shingle_size=3, min_tokens=20):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.min_tokens = min_tokens
+        self.bands = max_distance + 1
+        self.band_bits = self.BITS // self.bands
+        self.buckets = [{} for _ in range(self.bands)]
+        self.fingerprints = {}
+        self.stats = {'checked': 0, 'duplicates': 0, 'chars_saved': 0, 'seconds': 0.0}
+
+    def fingerprint(self, text):
+        """SimHash of text, or None if it is too short to fingerprint reliably"""
+        tokens = re.findall(r'\w+', text.lower())
+        if len(tokens) < self.min_tokens:
+            return None
+        shingles = {' '.join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+        # Lay the shingle hashes end to end as one bit string; every 64th character is then
+        # one bit column, which a C-level slice and count() tally without a Python loop per hash
+        bit_rows = ''.join([format(hash(shingle) & self.MASK, '064b') for shingle in shingles])
+        half = len(shingles) / 2
+        bits = ''.join('1' if bit_rows[i::self.BITS].count('1') > half else '0' for i in range(self.BITS))
+        return int(bits, 2)
+
+    def find(self, fingerprint):
+        """Return (key, distance) of the closest indexed near-duplicate, or None"""
+        best = None
+        seen = set()
+        for band, bucket in enumerate(self.buckets):
+            for key in bucket.get(self._band(fingerprint, band), ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = bin(fingerprint ^ self.fingerprints[key]).count('1')
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        return best
+
+    def add(self, key, fingerprint):
+        self.fingerprints[key] = fingerprint
+        for band, bucket in enumerate(self.buckets):
+            bucket.setdefault(self._band(fingerprint, band), []).append(key)
+
+    def check(self, key, text):
+        """Index text under key unless it near-duplicates an indexed page; returns the original's key if so"""
+        start = time.perf_counter()
+        self.stats['checked'] += 1
+        fingerprint = self.fingerprint(text)
+        match = self.find(fingerprint) if fingerprint is not None else None
+        if match:
+            self.stats['duplicates'] += 1
+            self.stats['chars_saved'] += len(text)
+        elif fingerprint is not None:
+            self.add(key, fingerprint)
+        self.stats['seconds'] += time.perf_counter() - start
+        return match[0] if match else None
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['indexed'] = len(self.fingerprints)
+        stats['avg_ms'] = round(stats.pop('seconds') / stats['checked'] * 1000, 3) if stats['checked'] else 0.0
+        return stats
+
+    def _band(self, fingerprint, band):
+        return (fingerprint >> (band * self.band_bits)) & ((1 << self.band_bits) - 1)
@@ -0,0 +1,102 @@
+"""HTML extraction engine benchmark.
+
+Runs every installed extraction engine over a corpus of saved pages and
+reports median extraction time, peak Python heap during extraction
+(tracemalloc; native allocations inside lxml/lexbor are not visible to it),
+average output length and how closely each engine's text matches the
+default html.parser output.
+
+Usage: python extraction_benchmark.py [CORPUS_DIR] [--runs N]
+
+CORPUS_DIR holds .html/.htm files, e.g. pages saved from past research
+sessions. Without it a synthetic corpus of small to very large pages is used.
+"""
+import os
+import time
+import argparse
+import statistics
+import tracemalloc
+from difflib import SequenceMatcher
+
+from html_extractors import EXTRACTORS, get_extractor
+
+BASELINE = 'html.parser'
+
+def synthetic_corpus():
+    corpus = []
+    for paragraphs in (20, 200, 2000):
+        body = ''.join(
+            f"<p>Paragraph {i} explains one more detail of the topic, with a <a href='/ref{i}'>reference</a>.</p>"
+            for i in range(paragraphs)
+        )
+        html = (f"<html><head><title>Synthetic {paragraphs}</title><script>var x = 1;</script></head>"
+                f"<body><header><nav><a href='/'>Home</a></nav></header><main><article>{body}</article></main>"
+                f"<footer>Footer text</footer></body></html>")
+        corpus.append((f"synthetic-{paragraphs}", html))
+    return corpus
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='replace') as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+def available_extractors():
+    extractors = {}
+    for name in EXTRACTORS:
+        try:
+            extractors[name] = get_extractor(name)
+        except ImportError as e:
+            print(f"Skipping {name}: {e}")
+    return extractors
+
+def time_extractor(extract, corpus, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for name, html in corpus:
+            extract(html, f"https://example.com/{name}")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def peak_memory(extract, corpus):
+    tracemalloc.start()
+    try:
+        for name, html in corpus:
+            extract(html, f"https://example.com/{name}")
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', nargs='?', help='directory of saved .html pages')
+    parser.add_argument('--runs', type=int, default=5, help='timed passes over the corpus per engine')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        parser.error(f"no .html files in {args.corpus}")
+    extractors = available_extractors()
+    total_bytes = sum(len(html.encode('utf-8')) for _, html in corpus)
+    print(f"{len(corpus)} pages, {total_bytes / 1024:.0f} KiB of HTML, median of {args.runs} runs\n")
+
+    baseline = {}
+    if BASELINE in extractors:
+        baseline = {name: extractors[BASELINE](html, f"https://example.com/{name}")['content'] for name, html in corpus}
+
+    print(f"{'engine':<14}{'ms/page':>10}{'peak KiB':>10}{'chars/page':>12}{'vs ' + BASELINE:>16}")
+    for engine, extract in extractors.items():
+        elapsed = time_extractor(extract, corpus, args.runs)
+        peak = peak_memory(extract, corpus)
+        outputs = {name: extract(html, f"https://example.com/{name}")['content'] for name, html in corpus}
+        chars = statistics.mean(len(text) for text in outputs.values())
+        similarity = ''
+        if baseline:
+            similarity = f"{statistics.mean(SequenceMatcher(None, baseline[name], text).ratio() for name, text in outputs.items()):.0%}"
+        print(f"{engine:<14}{elapsed / len(corpus) * 1000:>10.2f}{peak / 1024:>10.0f}{chars:>12.0f}{similarity:>16}")
+
+if __name__ == "__main__":
+    main()
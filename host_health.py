@@ -0,0 +1,122 @@
+import time
+import threading
+from collections import deque
+
+class HostHealth:
+    """Per-domain circuit breaker with latency-based timeouts.
+
+    failure_threshold consecutive failures (connection errors, timeouts, 5xx)
+    open a domain's circuit, and it is skipped for cooldown seconds. After
+    that a single trial request is let through: success closes the circuit,
+    failure reopens it with the cooldown doubled (up to max_cooldown).
+    Once a domain has min_samples latency samples, its timeout becomes
+    timeout_multiplier x its p95 time-to-headers, clamped to
+    [min_timeout, default].
+    """
+    TRIAL = 'trial'
+
+    def __init__(self, failure_threshold=3, cooldown=300, max_cooldown=3600, latency_window=50,
+                 min_samples=5, timeout_multiplier=3.0, min_timeout=2.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.latency_window = latency_window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.stats = {'skipped': 0, 'circuits_opened': 0}
+
+    def allow(self, domain):
+        """Truthy if a request to the domain may go ahead now.
+
+        Returns TRIAL when the request is the half-open probe; its caller must end it
+        with record_success, record_failure or release_trial however the request ends.
+        """
+        now = time.time()
+        with self.lock:
+            host = self.hosts.get(domain)
+            if host is None or host['open_until'] is None:
+                return True
+            if now < host['open_until'] or host['trial_in_flight']:
+                self.stats['skipped'] += 1
+                return False
+            # Cooldown over: let one trial request probe the host
+            host['trial_in_flight'] = True
+            return self.TRIAL
+
+    def record_success(self, domain, latency):
+        with self.lock:
+            host = self._host(domain)
+            host['latencies'].append(latency)
+            host['failures'] = 0
+            host['open_until'] = None
+            host['trial_in_flight'] = False
+            host['current_cooldown'] = self.cooldown
+
+    def record_failure(self, domain):
+        """Count a failure; returns True if the domain's circuit is now open"""
+        with self.lock:
+            host = self._host(domain)
+            host['failures'] += 1
+            if host['trial_in_flight']:
+                host['trial_in_flight'] = False
+                host['current_cooldown'] = min(self.max_cooldown, host['current_cooldown'] * 2)
+            elif host['failures'] < self.failure_threshold:
+                return False
+            host['open_until'] = time.time() + host['current_cooldown']
+            self.stats['circuits_opened'] += 1
+            return True
+
+    def release_trial(self, domain):
+        """End a trial that neither succeeded nor failed (e.g. a 404), so the next request can probe again"""
+        with self.lock:
+            host = self.hosts.get(domain)
+            if host:
+                host['trial_in_flight'] = False
+
+    def is_healthy(self, domain):
+        with self.lock:
+            host = self.hosts.get(domain)
+            return host is None or host['open_until'] is None or time.time() >= host['open_until']
+
+    def timeout_for(self, domain, default):
+        with self.lock:
+            host = self.hosts.get(domain)
+            if host is None or len(host['latencies']) < self.min_samples:
+                return default
+            p95 = self._percentile(host['latencies'], 0.95)
+        return max(self.min_timeout, min(default, p95 * self.timeout_multiplier))
+
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            stats = dict(self.stats)
+            stats['open_circuits'] = sorted(
+                domain for domain, host in self.hosts.items()
+                if host['open_until'] is not None and now < host['open_until']
+            )
+            stats['latency_p50'] = {
+                domain: round(self._percentile(host['latencies'], 0.5), 3)
+                for domain, host in self.hosts.items() if host['latencies']
+            }
+        return stats
+
+    def _host(self, domain):
+        host = self.hosts.get(domain)
+        if host is None:
+            host = {
+                'latencies': deque(maxlen=self.latency_window),
+                'failures': 0,
+                'open_until': None,
+                'trial_in_flight': False,
+                'current_cooldown': self.cooldown
+            }
+            self.hosts[domain] = host
+        return host
+
+    @staticmethod
+    def _percentile(samples, fraction):
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
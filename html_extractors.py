@@ -0,0 +1,142 @@
+import re
+import logging
+import importlib
+from functools import partial
+from urllib.parse import urljoin
+from passage_ranker import split_passages
+
+logger = logging.getLogger(__name__)
+
+MAX_CONTENT_CHARS = 2400
+MAX_PASSAGE_TEXT_CHARS = 24000
+MAX_LINKS = 10
+MAX_ANCHORS = 40
+MAX_ANCHOR_TEXT = 120
+UNWANTED_TAGS = ["script", "style", "nav", "footer", "header"]
+
+def _page(url, title, blocks, anchors):
+    """Build the extracted page from its text blocks (paragraphs) and (resolved url, anchor text) pairs.
+
+    content is the leading MAX_CONTENT_CHARS of text; passages hold up to
+    MAX_PASSAGE_TEXT_CHARS of it for query-ranked selection.
+    """
+    # Clean up whitespace
+    text = re.sub(r'\s+', ' ', ' '.join(blocks)).strip()
+    links = [link for link, _ in anchors]
+    outbound = [
+        [link, ' '.join(anchor_text.split())[:MAX_ANCHOR_TEXT]]
+        for link, anchor_text in anchors if link.startswith(('http://', 'https://'))
+    ]
+    return {
+        "url": url,
+        "title": title or "",
+        "content": text[:MAX_CONTENT_CHARS],
+        "passages": split_passages(blocks, max_chars=MAX_PASSAGE_TEXT_CHARS),
+        "links": links[:MAX_LINKS],
+        "anchors": outbound[:MAX_ANCHORS]  # kept for the link frontier
+    }
+
+def extract_with_soup(html, url, parser='html.parser'):
+    """BeautifulSoup extraction; parser is 'html.parser' (pure Python) or 'lxml'"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, parser)
+
+    # Remove unwanted elements
+    for element in soup(UNWANTED_TAGS):
+        element.decompose()
+
+    title = soup.title.string if soup.title else ""
+
+    # Try to find main content
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+    paragraphs = main_content.find_all('p') if main_content else soup.find_all('p')
+    blocks = [p.get_text().strip() for p in paragraphs]
+
+    # If no paragraphs found, get all text
+    if not ''.join(blocks):
+        blocks = soup.get_text().split('\n')
+
+    anchors = [(urljoin(url, a['href']), a.get_text(' ')) for a in soup.find_all('a', href=True)]
+    return _page(url, title, blocks, anchors)
+
+def extract_with_selectolax(html, url):
+    """Same selection rules as the soup extractor on selectolax's lexbor parser"""
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(UNWANTED_TAGS)
+
+    title_node = tree.css_first('title')
+    title = title_node.text() if title_node else ""
+
+    main_content = tree.css_first('main') or tree.css_first('article') or tree.css_first('div.content')
+    paragraphs = (main_content or tree).css('p')
+    blocks = [p.text().strip() for p in paragraphs]
+
+    if not ''.join(blocks) and tree.root is not None:
+        blocks = tree.root.text(separator='\n').split('\n')
+
+    anchors = [
+        (urljoin(url, a.attributes['href']), a.text(separator=' '))
+        for a in tree.css('a[href]') if a.attributes.get('href') is not None
+    ]
+    return _page(url, title, blocks, anchors)
+
+def extract_with_trafilatura(html, url):
+    """Boilerplate removal with trafilatura; title and anchors come from the same lxml tree"""
+    import lxml.html
+    import trafilatura
+    try:
+        tree = lxml.html.fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        tree = lxml.html.fromstring(html.encode('utf-8'))
+
+    title = tree.findtext('.//title') or ""
+    anchors = [
+        (urljoin(url, a.get('href')), a.text_content())
+        for a in tree.xpath('//a[@href][not(ancestor::nav or ancestor::header or ancestor::footer)]')
+    ]
+    # trafilatura prunes the tree it is given, so read title and anchors first
+    text = trafilatura.extract(tree, url=url, include_comments=False, include_tables=False)
+    if not text:
+        text = tree.text_content()
+    # trafilatura puts each paragraph on its own line
+    return _page(url, title, text.split('\n'), anchors)
+
+# Extraction engines: each name maps to the extractor and the module it needs, which
+# get_extractor imports up front so a missing optional dependency shows at startup.
+EXTRACTORS = {
+    'html.parser': (partial(extract_with_soup, parser='html.parser'), 'bs4'),
+    'lxml': (partial(extract_with_soup, parser='lxml'), 'lxml'),
+    'selectolax': (extract_with_selectolax, 'selectolax.lexbor'),
+    'trafilatura': (extract_with_trafilatura, 'trafilatura')
+}
+
+FALLBACK_EXTRACTOR = 'html.parser'
+_warned_fallbacks = set()
+
+def resolve_extractor(name):
+    """Name of the engine that will actually run for a configured name.
+
+    An engine whose package is not installed falls back to html.parser with a warning.
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unsupported extractor: {name}")
+    module_name = EXTRACTORS[name][1]
+    try:
+        importlib.import_module(module_name)
+    except ImportError as e:
+        if name == FALLBACK_EXTRACTOR:
+            raise
+        if name not in _warned_fallbacks:
+            _warned_fallbacks.add(name)
+            logger.warning(
+                f"Extractor '{name}' is unavailable ({str(e)}); install its package "
+                f"(pip install {module_name.split('.')[0]}) or pick another. Using {FALLBACK_EXTRACTOR} instead."
+            )
+        return FALLBACK_EXTRACTOR
+    return name
+
+def get_extractor(name):
+    """Return the extract(html, url) function for a configured engine name"""
+    return EXTRACTORS[resolve_extractor(name)][0]
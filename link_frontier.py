@@ -0,0 +1,109 @@
+import re
+import heapq
+import threading
+from urllib.parse import urlsplit
+from url_index import canonicalize_url
+
+TOKEN = re.compile(r'[a-z0-9]+')
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.gz',
+                      '.mp3', '.mp4', '.avi', '.mov', '.exe', '.dmg', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx')
+
+def terms(text, stop_words=()):
+    return {token for token in TOKEN.findall(text.lower()) if len(token) > 2 and token not in stop_words}
+
+class LinkFrontier:
+    """Priority queue of outbound links from scraped pages, scored against the research focus.
+
+    A link scores by how many focus terms appear in its anchor text (counted
+    twice) and its URL path, normalised by the number of focus terms and
+    discounted by crawl depth. Links with no matching term are never queued.
+    Pages reached from search results are depth 0; their links are depth 1,
+    and links beyond max_depth are ignored. At most max_per_domain pages are
+    taken from one domain per session.
+    """
+    def __init__(self, max_depth=1, max_per_domain=3, max_size=500, stop_words=()):
+        self.max_depth = max_depth
+        self.max_per_domain = max_per_domain
+        self.max_size = max_size
+        self.stop_words = set(stop_words)
+        self.focus_terms = set()
+        self.heap = []
+        self.queued = {}
+        self.taken_per_domain = {}
+        self.lock = threading.Lock()
+        self.stats = {'links_seen': 0, 'queued': 0, 'taken': 0}
+
+    def set_focus(self, focus_text):
+        """Score queued links against a new focus from now on"""
+        with self.lock:
+            self.focus_terms = terms(focus_text, self.stop_words)
+            self.heap = []
+            for key, (_, anchor_terms, path_terms, depth) in self.queued.items():
+                score = self._score(anchor_terms, path_terms, depth)
+                if score > 0:
+                    self.heap.append((-score, key))
+            heapq.heapify(self.heap)
+
+    def add_page(self, page_url, anchors, depth=0):
+        """Queue the outbound links of a page found at the given depth"""
+        if depth + 1 > self.max_depth:
+            return
+        page_key = canonicalize_url(page_url)
+        with self.lock:
+            for url, anchor_text in anchors:
+                self.stats['links_seen'] += 1
+                key = canonicalize_url(url)
+                path = urlsplit(key).path.lower()
+                if key == page_key or key in self.queued or path.endswith(SKIPPED_EXTENSIONS):
+                    continue
+                anchor_terms = terms(anchor_text, self.stop_words)
+                path_terms = terms(path, self.stop_words)
+                score = self._score(anchor_terms, path_terms, depth + 1)
+                if score <= 0:
+                    continue
+                self.queued[key] = (url, anchor_terms, path_terms, depth + 1)
+                heapq.heappush(self.heap, (-score, key))
+                self.stats['queued'] += 1
+            self._trim()
+
+    def pop(self, count, is_known=None):
+        """Take up to count of the best links as (url, depth), skipping known pages and full domains"""
+        taken = []
+        with self.lock:
+            while self.heap and len(taken) < count:
+                _, key = heapq.heappop(self.heap)
+                entry = self.queued.pop(key, None)
+                if entry is None:
+                    continue
+                url, _, _, depth = entry
+                domain = urlsplit(key).netloc
+                if self.taken_per_domain.get(domain, 0) >= self.max_per_domain:
+                    continue
+                if is_known and is_known(url):
+                    continue
+                self.taken_per_domain[domain] = self.taken_per_domain.get(domain, 0) + 1
+                self.stats['taken'] += 1
+                taken.append((url, depth))
+        return taken
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self.queued)
+        return stats
+
+    def _score(self, anchor_terms, path_terms, depth):
+        if not self.focus_terms:
+            return 0.0
+        matches = 2 * len(self.focus_terms & anchor_terms) + len(self.focus_terms & path_terms)
+        return matches / len(self.focus_terms) / depth
+
+    def _trim(self):
+        """Keep only the max_size best links"""
+        if len(self.queued) <= self.max_size:
+            return
+        best = heapq.nsmallest(self.max_size, self.heap)
+        keep = {key for _, key in best}
+        self.queued = {key: entry for key, entry in self.queued.items() if key in keep}
+        self.heap = best
+        heapq.heapify(self.heap)
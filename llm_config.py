@@ -16,7 +16,10 @@ LLM_CONFIG_LLAMA_CPP = {
     "top_k": 40,  # top k for sampling
     "repeat_penalty": 1.1,  # repeat penalty
     "max_tokens": 1024,  # max tokens to generate
-    "stop": ["User:", "\n\n"]  # stop sequences
+    "stop": ["User:", "\n\n"],  # stop sequences
+    "prompt_cache": None,  # opt-in KV state reuse for shared prompt prefixes: 'ram', 'disk' (persists, needs diskcache) or None
+    "prompt_cache_dir": "cache/llama_prompt_cache",  # location of the 'disk' prompt cache
+    "prompt_cache_capacity_bytes": 2 << 30  # max size of saved KV states
 }
 
 # LLM settings for Ollama
@@ -28,7 +31,15 @@ LLM_CONFIG_OLLAMA = {
     "top_p": 0.9,
     "n_ctx": 55000,
     "context_length": 55000,
-    "stop": ["User:", "\n\n"]
+    "stop": ["User:", "\n\n"],
+    "pool_connections": 1,  # number of host pools kept by the HTTP session
+    "pool_maxsize": 4,  # max keep-alive connections to the Ollama server
+    "keep_alive": True,  # reuse HTTP connections between generations
+    "connect_timeout": 10,  # seconds to establish a connection
+    "read_timeout": 600,  # seconds to wait between streamed chunks
+    "max_concurrency": 4,  # concurrent async requests (match OLLAMA_NUM_PARALLEL)
+    "max_in_flight": 2,  # requests sent to the server at once; lower lets interactive calls jump ahead sooner
+    "priority_aging_seconds": 30  # queued background calls gain one priority class per interval
 }
 
 # LLM settings for OpenAI
@@ -42,20 +53,121 @@ LLM_CONFIG_OPENAI = {
     "max_tokens": 4096,
     "stop": ["User:", "\n\n"],
     "presence_penalty": 0,
-    "frequency_penalty": 0
+    "frequency_penalty": 0,
+    "max_concurrency": 4,  # concurrent async requests
+    "max_in_flight": 4,  # requests sent to the API at once
+    "priority_aging_seconds": 30  # queued background calls gain one priority class per interval
 }
 
 # LLM settings for Anthropic
 LLM_CONFIG_ANTHROPIC = {
     "llm_type": "anthropic",
     "api_key": "",  # Set via environment variable ANTHROPIC_API_KEY
+    "base_url": None,  # Optional: Set to use an alternative Anthropic-compatible endpoint
     "model_name": "claude-3-5-sonnet-latest",  # Required: Specify the model to use
     "temperature": 0.7,
     "top_p": 0.9,
     "max_tokens": 4096,
-    "stop": ["User:", "\n\n"]
+    "stop": ["User:", "\n\n"],
+    "max_concurrency": 4,  # concurrent async requests
+    "max_in_flight": 4,  # requests sent to the API at once
+    "priority_aging_seconds": 30  # queued background calls gain one priority class per interval
+}
+
+# Prompt/response cache shared by all backends (opt-in)
+LLM_CACHE_CONFIG = {
+    "enabled": False,  # set True to reuse responses for repeated prompts
+    "path": "cache/llm_responses.sqlite3",  # on-disk SQLite store
+    "memory_entries": 256,  # size of the in-memory LRU tier
+    "max_disk_bytes": 64 * 1024 * 1024,  # size bound of the on-disk tier
+    "ttl": 7 * 24 * 3600,  # seconds before a cached response expires
+    # calls sampled above this temperature bypass the cache; None uses the backend's configured temperature,
+    # so calls at the default settings are cached and retries opt out with use_cache=False
+    "max_temperature": None
+}
+
+def get_llm_cache_config():
+    return LLM_CACHE_CONFIG
+
+# Web scraping settings
+SCRAPER_CONFIG = {
+    "engine": "threads",  # "threads" (requests + thread pool) or "asyncio" (aiohttp)
+    "extractor": "html.parser",  # "html.parser", "lxml", "selectolax" or "trafilatura"
+    "parse_workers": 0,  # extractor processes; 0 parses on the fetch threads (best for a few pages per search)
+    "parse_queue_size": None,  # pages waiting for a parser before fetchers pause (default 2 per worker)
+    "max_page_bytes": 2 * 1024 * 1024,  # stop downloading a page after this many bytes
+    "stop_when_content_filled": True,  # stop once a page holds as much text as extraction keeps
+    "rank_passages": True,  # build page content from the passages that best match the query (BM25)
+    "content_budget_chars": 2400,  # characters of ranked passages kept per page
+    "content_budget_tokens": None,  # optional token cap on those passages (counted like the document budget)
+    "respect_robots_txt": True,  # skip pages that robots.txt disallows
+    "robots_ttl": 24 * 3600,  # seconds a domain's robots.txt is trusted before it is fetched again
+    "max_workers": 5,  # pages fetched in parallel
+    "page_deadline": 20,  # seconds allowed per page, including retries
+    "scrape_deadline": 30,  # seconds allowed for one batch of pages; stragglers are abandoned
+    "circuit_failure_threshold": 3,  # consecutive failures before a domain is skipped
+    "circuit_cooldown": 300,  # seconds a failing domain is skipped before it is retried
+    "pool_hosts": 20,  # hosts whose keep-alive connections are kept open
+    "max_connections_per_host": 4,  # concurrent connections to a single host
+    "requests_per_second": 1.0,  # sustained request rate per domain
+    "burst": 1,  # requests a domain may receive back to back before the rate applies
+    "min_requests_per_second": 0.05,  # floor for the adaptive slowdown after 429/503 responses
+    "async_max_in_flight": 200  # requests in flight at once with the asyncio engine
+}
+
+def get_scraper_config():
+    return SCRAPER_CONFIG
+
+# Cache of extracted pages, revalidated with conditional GETs once stale
+PAGE_CACHE_CONFIG = {
+    "enabled": True,
+    "path": "cache/pages.sqlite3",  # on-disk SQLite store
+    "max_disk_bytes": 128 * 1024 * 1024,  # size bound of the compressed store
+    "ttl": 24 * 3600  # seconds a page is served without revalidation
 }
 
+def get_page_cache_config():
+    return PAGE_CACHE_CONFIG
+
+# Pages already researched, remembered across sessions so they are not selected again
+URL_INDEX_CONFIG = {
+    "enabled": True,
+    "path": "cache/seen_urls.sqlite3",  # on-disk SQLite store
+    "memory_entries": 10000,  # recently confirmed urls kept in memory
+    "scope": "topic",  # "topic": a page counts as seen for the same research topic; "global": for any topic
+    "skip_previous_sessions": True  # False: record pages but research them again in new sessions
+}
+
+def get_url_index_config():
+    return URL_INDEX_CONFIG
+
+# Follow promising outbound links from scraped pages, ranked against the current focus area
+LINK_FRONTIER_CONFIG = {
+    "enabled": False,
+    "max_depth": 1,  # 1: only links found on pages from search results
+    "max_per_domain": 3,  # frontier pages taken from one domain per session
+    "pages_per_focus": 2,  # frontier pages scraped after each focus area's searches
+    "max_size": 500  # best-scoring links kept in the frontier
+}
+
+def get_link_frontier_config():
+    return LINK_FRONTIER_CONFIG
+
+# DuckDuckGo searches go through one persistent client and a result cache
+SEARCH_CONFIG = {
+    "cache_enabled": True,
+    "path": "cache/search_results.sqlite3",  # on-disk SQLite store
+    "memory_entries": 256,  # size of the in-memory LRU tier
+    "max_disk_bytes": 16 * 1024 * 1024,  # size bound of the on-disk tier
+    # seconds results are reused, per time range: short for the past day, long for no limit
+    "ttls": {"d": 3600, "w": 6 * 3600, "m": 24 * 3600, "y": 7 * 24 * 3600, "none": 7 * 24 * 3600},
+    "max_results": 10,  # results requested per search
+    "timeout": 10  # seconds per search request
+}
+
+def get_search_config():
+    return SEARCH_CONFIG
+
 def get_llm_config():
     if LLM_TYPE == "llama_cpp":
         return LLM_CONFIG_LLAMA_CPP
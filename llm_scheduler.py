@@ -0,0 +1,89 @@
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+
+# Priority classes, lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+class LLMScheduler:
+    """Priority-aware admission control in front of an LLM backend.
+
+    Callers wait in a shared queue until one of max_in_flight slots is free.
+    The waiting request with the best effective priority is admitted first;
+    a request's effective priority improves by one class for every
+    aging_seconds it has waited, so background work is delayed by
+    interactive requests but never starved. Within a class, requests are
+    served in arrival order.
+    """
+    def __init__(self, max_in_flight=1, aging_seconds=30.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.aging_seconds = aging_seconds
+        self.condition = threading.Condition()
+        self.waiting = []
+        self.in_flight = 0
+        self.sequence = itertools.count()
+        self.stats = {
+            'admitted': 0,
+            'max_queue_depth': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'wait_seconds_by_priority': {}
+        }
+
+    def acquire(self, priority=PRIORITY_BACKGROUND):
+        """Block until an in-flight slot is granted; every acquire() needs a matching release()"""
+        ticket = (priority, next(self.sequence), time.time())
+        with self.condition:
+            self.waiting.append(ticket)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self.waiting))
+            while self.in_flight >= self.max_in_flight or self._next_ticket() is not ticket:
+                # Wake up periodically so aging can reorder the queue
+                self.condition.wait(timeout=self.aging_seconds)
+            self.waiting.remove(ticket)
+            self.in_flight += 1
+            self._record_wait(priority, time.time() - ticket[2])
+            # Another slot may still be free for the next waiter
+            self.condition.notify_all()
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority=PRIORITY_BACKGROUND):
+        """Hold an in-flight slot for the duration of the with block"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def run(self, function, *args, priority=PRIORITY_BACKGROUND, **kwargs):
+        with self.slot(priority):
+            return function(*args, **kwargs)
+
+    def get_metrics(self):
+        with self.condition:
+            stats = dict(self.stats)
+            stats['wait_seconds_by_priority'] = dict(self.stats['wait_seconds_by_priority'])
+            stats['queue_depth'] = len(self.waiting)
+            stats['in_flight'] = self.in_flight
+        stats['avg_wait_seconds'] = stats['total_wait_seconds'] / stats['admitted'] if stats['admitted'] else 0.0
+        return stats
+
+    def _next_ticket(self):
+        now = time.time()
+        return min(
+            self.waiting,
+            key=lambda ticket: (ticket[0] - int((now - ticket[2]) / self.aging_seconds), ticket[1])
+        )
+
+    def _record_wait(self, priority, waited):
+        self.stats['admitted'] += 1
+        self.stats['total_wait_seconds'] += waited
+        self.stats['max_wait_seconds'] = max(self.stats['max_wait_seconds'], waited)
+        by_priority = self.stats['wait_seconds_by_priority']
+        by_priority[priority] = by_priority.get(priority, 0.0) + waited
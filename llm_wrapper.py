@@ -1,36 +1,196 @@
 import os
-from llama_cpp import Llama
+import logging
+import importlib
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from llm_config import get_llm_config
-from openai import OpenAI
-from anthropic import Anthropic
+import time
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+from llm_config import get_llm_config, get_llm_cache_config
+from llm_cache import LLMResponseCache
+from llm_scheduler import LLMScheduler, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class LLMBackend:
+    """One LLM type: the SDK module it needs and the callables that drive it.
+
+    initialize(wrapper), generate(wrapper, prompt, **kwargs) and
+    stream(wrapper, prompt, **kwargs) receive the LLMWrapper, whose
+    .backend attribute holds the imported module.
+    """
+    module: Optional[str]
+    initialize: Callable
+    generate: Callable
+    stream: Callable
+
+# Backend plugins, filled by register_backend. The SDK module is only imported when
+# that backend is selected, so unused SDKs cost nothing at startup.
+LLM_BACKENDS = {}
+
+def register_backend(llm_type, backend):
+    LLM_BACKENDS[llm_type] = backend
+
+def load_backend(llm_type):
+    """Return the selected LLMBackend and its imported SDK module (None for plain HTTP backends)"""
+    if llm_type not in LLM_BACKENDS:
+        raise ValueError(f"Unsupported LLM type: {llm_type}")
+    backend = LLM_BACKENDS[llm_type]
+    return backend, importlib.import_module(backend.module) if backend.module else None
+
+@dataclass
+class CachedPrompt:
+    """Prompt split into a stable prefix that providers may cache and a variable suffix"""
+    prefix: str
+    suffix: str
+
+    def __str__(self):
+        return self.prefix + self.suffix
 
 class LLMWrapper:
     def __init__(self):
         self.llm_config = get_llm_config()
         self.llm_type = self.llm_config.get('llm_type', 'llama_cpp')
-        
-        if self.llm_type == 'llama_cpp':
-            self.llm = self._initialize_llama_cpp()
-        elif self.llm_type == 'ollama':
-            self.base_url = self.llm_config.get('base_url', 'http://localhost:11434')
-            self.model_name = self.llm_config.get('model_name', 'your_model_name')
-        elif self.llm_type == 'openai':
-            self._initialize_openai()
-        elif self.llm_type == 'anthropic':
-            self._initialize_anthropic()
-        else:
-            raise ValueError(f"Unsupported LLM type: {self.llm_type}")
+        self.backend_spec, self.backend = load_backend(self.llm_type)
+        self.backend_spec.initialize(self)
+
+        self.cache_config = get_llm_cache_config()
+        self.cache = self._initialize_cache()
+
+        # An in-process llama_cpp model can only serve one call at a time
+        max_in_flight = 1 if self.llm_type == 'llama_cpp' else self.llm_config.get('max_in_flight', 1)
+        self.scheduler = LLMScheduler(
+            max_in_flight=max_in_flight,
+            aging_seconds=self.llm_config.get('priority_aging_seconds', 30.0)
+        )
+
+        self._usage_lock = threading.Lock()
+        self.prompt_cache_stats = {
+            'requests': 0,
+            'cached_input_tokens': 0,
+            'cache_write_tokens': 0,
+            'uncached_input_tokens': 0
+        }
+        self.batch_stats = {
+            'batches': 0,
+            'prompts': 0,
+            'total_seconds': 0.0,
+            'last_batch_size': 0,
+            'last_batch_seconds': 0.0
+        }
+
+    def _initialize_cache(self):
+        if not self.cache_config.get('enabled', False):
+            return None
+        return LLMResponseCache(
+            path=self.cache_config.get('path', 'cache/llm_responses.sqlite3'),
+            memory_entries=self.cache_config.get('memory_entries', 256),
+            max_disk_bytes=self.cache_config.get('max_disk_bytes', 64 * 1024 * 1024),
+            ttl=self.cache_config.get('ttl', 7 * 24 * 3600)
+        )
+
+    def _cache_key(self, prompt, kwargs):
+        """Return the cache key for a call, or None when the call must not be cached"""
+        if not self.cache:
+            return None
+        configured_temperature = self.llm_config.get('temperature', 0.7)
+        temperature = kwargs.get('temperature', configured_temperature)
+        max_temperature = self.cache_config.get('max_temperature')
+        if temperature > (configured_temperature if max_temperature is None else max_temperature):
+            self.cache.record_bypass()
+            return None
+        params = {
+            'temperature': temperature,
+            'top_p': kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
+            'max_tokens': kwargs.get('max_tokens', self.llm_config.get('max_tokens')),
+            'stop': kwargs.get('stop', self.llm_config.get('stop', []))
+        }
+        model = self.llm_config.get('model_name') or self.llm_config.get('model_path')
+        return LLMResponseCache.make_key(self.llm_type, model, str(prompt), params)
+
+    def get_cache_stats(self):
+        """Return hit/miss counters for the response cache"""
+        return self.cache.get_stats() if self.cache else {}
 
     def _initialize_llama_cpp(self):
-        return Llama(
+        self.llm = self._load_llama_cpp_model()
+
+    def _load_llama_cpp_model(self):
+        llm = self.backend.Llama(
             model_path=self.llm_config.get('model_path'),
             n_ctx=self.llm_config.get('n_ctx', 55000),
             n_gpu_layers=self.llm_config.get('n_gpu_layers', 0),
             n_threads=self.llm_config.get('n_threads', 8),
             verbose=False
         )
+        prompt_cache = self._initialize_prompt_cache()
+        if prompt_cache is not None:
+            llm.set_cache(prompt_cache)
+        return llm
+
+    def _initialize_prompt_cache(self):
+        """Cache evaluated KV state so prompts sharing a long prefix only evaluate the new tokens"""
+        cache_type = self.llm_config.get('prompt_cache')
+        capacity = self.llm_config.get('prompt_cache_capacity_bytes', 2 << 30)
+        if cache_type == 'ram':
+            return self.backend.LlamaRAMCache(capacity_bytes=capacity)
+        elif cache_type == 'disk':
+            try:
+                return self.backend.LlamaDiskCache(
+                    cache_dir=self.llm_config.get('prompt_cache_dir', 'cache/llama_prompt_cache'),
+                    capacity_bytes=capacity
+                )
+            except ImportError as e:
+                logger.warning(f"Disk prompt cache unavailable ({str(e)}), using RAM cache")
+                return self.backend.LlamaRAMCache(capacity_bytes=capacity)
+        return None
+
+    def _initialize_ollama(self):
+        self.base_url = self.llm_config.get('base_url', 'http://localhost:11434')
+        self.model_name = self.llm_config.get('model_name', 'your_model_name')
+        self.session = self._initialize_ollama_session()
+
+    def _initialize_ollama_session(self):
+        """Create a long-lived pooled session so generations reuse keep-alive connections"""
+        pool_size = self.llm_config.get('pool_maxsize', 4)
+        adapter = HTTPAdapter(
+            pool_connections=self.llm_config.get('pool_connections', 1),
+            pool_maxsize=pool_size,
+            pool_block=self.llm_config.get('pool_block', False)
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if self.llm_config.get('keep_alive', True):
+            session.headers.update({'Connection': 'keep-alive'})
+        else:
+            session.headers.update({'Connection': 'close'})
+        self._ollama_adapter = adapter
+        self._ollama_requests = 0
+        return session
+
+    def _ollama_timeout(self):
+        return (
+            self.llm_config.get('connect_timeout', 10),
+            self.llm_config.get('read_timeout', 600)
+        )
+
+    def get_connection_stats(self):
+        """Return connection reuse counters for the pooled Ollama session"""
+        if self.llm_type != 'ollama':
+            return {}
+        pools = self._ollama_adapter.poolmanager.pools
+        new_connections = sum(pools[key].num_connections for key in pools.keys())
+        return {
+            'requests': self._ollama_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(0, self._ollama_requests - new_connections),
+            'pool_maxsize': self.llm_config.get('pool_maxsize', 4)
+        }
 
     def _initialize_openai(self):
         api_key = os.getenv('OPENAI_API_KEY') or self.llm_config.get('api_key')
@@ -47,7 +207,7 @@ class LLMWrapper:
         if base_url:
             client_kwargs['base_url'] = base_url
             
-        self.client = OpenAI(**client_kwargs)
+        self.client = self.backend.OpenAI(**client_kwargs)
         self.model_name = model_name
 
     def _initialize_anthropic(self):
@@ -59,28 +219,108 @@ class LLMWrapper:
         if not model_name:
             raise ValueError("Anthropic model name not specified in config")
             
-        self.client = Anthropic(api_key=api_key)
+        client_kwargs = {'api_key': api_key}
+        base_url = self.llm_config.get('base_url')
+        if base_url:
+            client_kwargs['base_url'] = base_url
+
+        self.client = self.backend.Anthropic(**client_kwargs)
         self.model_name = model_name
 
     def generate(self, prompt, **kwargs):
+        priority = kwargs.pop('priority', PRIORITY_BACKGROUND)
+        use_cache = kwargs.pop('use_cache', True)
+        cache_key = self._cache_key(prompt, kwargs) if use_cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with self.scheduler.slot(priority):
+            response = self._generate(prompt, **kwargs)
+        if cache_key and response:
+            self.cache.set(cache_key, response)
+        return response
+
+    def _generate(self, prompt, **kwargs):
+        return self.backend_spec.generate(self, prompt, **kwargs)
+
+    def generate_batch(self, prompts, **kwargs):
+        """Generate responses for independent prompts in one step, returned in prompt order.
+
+        HTTP backends dispatch the prompts concurrently through AsyncLLMWrapper,
+        up to max_concurrency. llama_cpp evaluates one sequence at a time, so
+        prompts are run in sorted order to let neighbours with a shared prefix
+        reuse the evaluated KV state. A prompt that fails yields its exception
+        instance instead of a string. Call it from synchronous code only.
+        """
+        start = time.time()
+        results = [None] * len(prompts)
         if self.llm_type == 'llama_cpp':
-            llama_kwargs = self._prepare_llama_kwargs(kwargs)
-            response = self.llm(prompt, **llama_kwargs)
-            return response['choices'][0]['text'].strip()
-        elif self.llm_type == 'ollama':
-            return self._ollama_generate(prompt, **kwargs)
-        elif self.llm_type == 'openai':
-            return self._openai_generate(prompt, **kwargs)
-        elif self.llm_type == 'anthropic':
-            return self._anthropic_generate(prompt, **kwargs)
-        else:
-            raise ValueError(f"Unsupported LLM type: {self.llm_type}")
+            for index in sorted(range(len(prompts)), key=lambda i: str(prompts[i])):
+                try:
+                    results[index] = self.generate(prompts[index], **kwargs)
+                except Exception as e:
+                    results[index] = e
+        elif prompts:
+            results = asyncio.run(self._generate_concurrently(prompts, **kwargs))
+        elapsed = time.time() - start
+
+        with self._usage_lock:
+            self.batch_stats['batches'] += 1
+            self.batch_stats['prompts'] += len(prompts)
+            self.batch_stats['total_seconds'] += elapsed
+            self.batch_stats['last_batch_size'] = len(prompts)
+            self.batch_stats['last_batch_seconds'] = elapsed
+        return results
+
+    async def _generate_concurrently(self, prompts, **kwargs):
+        # Imported here so the asyncio clients are only loaded when a batch is run
+        from async_llm_wrapper import AsyncLLMWrapper
+        async with AsyncLLMWrapper(self) as async_llm:
+            return await async_llm.generate_many(prompts, **kwargs)
+
+    def get_batch_metrics(self):
+        """Return latency and throughput figures for generate_batch calls"""
+        with self._usage_lock:
+            stats = dict(self.batch_stats)
+        stats['last_throughput'] = (
+            stats['last_batch_size'] / stats['last_batch_seconds'] if stats['last_batch_seconds'] else 0.0
+        )
+        stats['avg_batch_seconds'] = stats['total_seconds'] / stats['batches'] if stats['batches'] else 0.0
+        stats['throughput'] = stats['prompts'] / stats['total_seconds'] if stats['total_seconds'] else 0.0
+        return stats
+
+    def generate_stream(self, prompt, **kwargs):
+        """Yield response tokens as the backend produces them"""
+        priority = kwargs.pop('priority', PRIORITY_BACKGROUND)
+        kwargs.pop('use_cache', None)
+        with self.scheduler.slot(priority):
+            yield from self.backend_spec.stream(self, prompt, **kwargs)
+
+    def _llama_cpp_generate(self, prompt, **kwargs):
+        llama_kwargs = self._prepare_llama_kwargs(kwargs)
+        response = self.llm(str(prompt), **llama_kwargs)
+        return response['choices'][0]['text'].strip()
+
+    def _llama_cpp_stream(self, prompt, **kwargs):
+        llama_kwargs = self._prepare_llama_kwargs(kwargs)
+        for chunk in self.llm(str(prompt), stream=True, **llama_kwargs):
+            text = chunk['choices'][0]['text']
+            if text:
+                yield text
+
+    def get_scheduler_metrics(self):
+        """Return queue depth and wait time figures for the request scheduler"""
+        return self.scheduler.get_metrics()
 
     def _ollama_generate(self, prompt, **kwargs):
-        url = f"{self.base_url}/api/generate"
-        data = {
+        return ''.join(self._ollama_stream(prompt, **kwargs)).strip()
+
+    def _ollama_request(self, prompt, kwargs):
+        return {
             'model': self.model_name,
-            'prompt': prompt,
+            'prompt': str(prompt),
             'options': {
                 'temperature': kwargs.get('temperature', self.llm_config.get('temperature', 0.7)),
                 'top_p': kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
@@ -89,50 +329,142 @@ class LLMWrapper:
                 'num_ctx': self.llm_config.get('n_ctx', 55000)
             }
         }
-        response = requests.post(url, json=data, stream=True)
-        if response.status_code != 200:
-            raise Exception(f"Ollama API request failed with status {response.status_code}: {response.text}")
-        text = ''.join(json.loads(line)['response'] for line in response.iter_lines() if line)
-        return text.strip()
+
+    def _ollama_stream(self, prompt, **kwargs):
+        url = f"{self.base_url}/api/generate"
+        data = self._ollama_request(prompt, kwargs)
+        with self._usage_lock:
+            self._ollama_requests += 1
+        with self.session.post(url, json=data, stream=True, timeout=self._ollama_timeout()) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API request failed with status {response.status_code}: {response.text}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done'):
+                    break
+
+    def _openai_request(self, prompt, kwargs):
+        # OpenAI caches prompt prefixes automatically; the stable prefix just has to come first
+        return {
+            'model': self.model_name,
+            'messages': [{"role": "user", "content": str(prompt)}],
+            'temperature': kwargs.get('temperature', self.llm_config.get('temperature', 0.7)),
+            'top_p': kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
+            'max_tokens': kwargs.get('max_tokens', self.llm_config.get('max_tokens', 4096)),
+            'stop': kwargs.get('stop', self.llm_config.get('stop', [])),
+            'presence_penalty': self.llm_config.get('presence_penalty', 0),
+            'frequency_penalty': self.llm_config.get('frequency_penalty', 0)
+        }
 
     def _openai_generate(self, prompt, **kwargs):
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=kwargs.get('temperature', self.llm_config.get('temperature', 0.7)),
-                top_p=kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
-                max_tokens=kwargs.get('max_tokens', self.llm_config.get('max_tokens', 4096)),
-                stop=kwargs.get('stop', self.llm_config.get('stop', [])),
-                presence_penalty=self.llm_config.get('presence_penalty', 0),
-                frequency_penalty=self.llm_config.get('frequency_penalty', 0)
-            )
+            response = self.client.chat.completions.create(**self._openai_request(prompt, kwargs))
+            self._record_openai_usage(response.usage)
             return response.choices[0].message.content.strip()
         except Exception as e:
             raise Exception(f"OpenAI API request failed: {str(e)}")
 
+    def _openai_stream(self, prompt, **kwargs):
+        try:
+            request = self._openai_request(prompt, kwargs)
+            if isinstance(prompt, CachedPrompt):
+                # Usage, including cached tokens, arrives in a final chunk with no choices
+                request['stream_options'] = {'include_usage': True}
+            stream = self.client.chat.completions.create(stream=True, **request)
+            for chunk in stream:
+                if getattr(chunk, 'usage', None):
+                    self._record_openai_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise Exception(f"OpenAI API request failed: {str(e)}")
+
+    def _anthropic_request(self, prompt, kwargs):
+        return {
+            'model': self.model_name,
+            'max_tokens': kwargs.get('max_tokens', self.llm_config.get('max_tokens', 4096)),
+            'temperature': kwargs.get('temperature', self.llm_config.get('temperature', 0.7)),
+            'top_p': kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
+            'messages': [{
+                "role": "user",
+                "content": self._anthropic_content(prompt)
+            }]
+        }
+
+    @staticmethod
+    def _anthropic_content(prompt):
+        """Mark the stable prefix of a CachedPrompt as a prompt caching breakpoint"""
+        if not isinstance(prompt, CachedPrompt):
+            return prompt
+        return [
+            {"type": "text", "text": prompt.prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt.suffix}
+        ]
+
     def _anthropic_generate(self, prompt, **kwargs):
         try:
-            response = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=kwargs.get('max_tokens', self.llm_config.get('max_tokens', 4096)),
-                temperature=kwargs.get('temperature', self.llm_config.get('temperature', 0.7)),
-                top_p=kwargs.get('top_p', self.llm_config.get('top_p', 0.9)),
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
+            response = self.client.messages.create(**self._anthropic_request(prompt, kwargs))
+            self._record_anthropic_usage(response.usage)
             return response.content[0].text.strip()
         except Exception as e:
             raise Exception(f"Anthropic API request failed: {str(e)}")
 
+    def _anthropic_stream(self, prompt, **kwargs):
+        try:
+            with self.client.messages.stream(**self._anthropic_request(prompt, kwargs)) as stream:
+                for text in stream.text_stream:
+                    yield text
+                self._record_anthropic_usage(stream.get_final_message().usage)
+        except Exception as e:
+            raise Exception(f"Anthropic API request failed: {str(e)}")
+
+    def _record_openai_usage(self, usage):
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = (getattr(details, 'cached_tokens', None) or 0) if details else 0
+        self._record_usage(cached, 0, (usage.prompt_tokens or 0) - cached)
+
+    def _record_anthropic_usage(self, usage):
+        if usage is None:
+            return
+        self._record_usage(
+            getattr(usage, 'cache_read_input_tokens', None) or 0,
+            getattr(usage, 'cache_creation_input_tokens', None) or 0,
+            usage.input_tokens or 0
+        )
+
+    def _record_usage(self, cached, written, uncached):
+        with self._usage_lock:
+            self.prompt_cache_stats['requests'] += 1
+            self.prompt_cache_stats['cached_input_tokens'] += cached
+            self.prompt_cache_stats['cache_write_tokens'] += written
+            self.prompt_cache_stats['uncached_input_tokens'] += uncached
+        logger.info(f"Prompt tokens: {cached} cached, {written} written to cache, {uncached} uncached")
+
+    def get_prompt_cache_stats(self):
+        """Return cached vs uncached input token totals reported by the provider"""
+        with self._usage_lock:
+            stats = dict(self.prompt_cache_stats)
+        total = stats['cached_input_tokens'] + stats['cache_write_tokens'] + stats['uncached_input_tokens']
+        stats['cached_ratio'] = stats['cached_input_tokens'] / total if total else 0.0
+        return stats
+
     def _cleanup(self):
         """Force terminate any running LLM processes"""
         if self.llm_type == 'ollama':
             try:
                 # Force terminate Ollama process
-                requests.post(f"{self.base_url}/api/terminate")
+                self.session.post(f"{self.base_url}/api/terminate", timeout=self._ollama_timeout())
+            except:
+                pass
+
+            try:
+                self.session.close()
             except:
                 pass
 
@@ -152,3 +484,17 @@ class LLMWrapper:
             'echo': False,
         }
         return llama_kwargs
+
+register_backend('llama_cpp', LLMBackend(
+    'llama_cpp', LLMWrapper._initialize_llama_cpp, LLMWrapper._llama_cpp_generate, LLMWrapper._llama_cpp_stream
+))
+# Ollama is plain HTTP through requests
+register_backend('ollama', LLMBackend(
+    None, LLMWrapper._initialize_ollama, LLMWrapper._ollama_generate, LLMWrapper._ollama_stream
+))
+register_backend('openai', LLMBackend(
+    'openai', LLMWrapper._initialize_openai, LLMWrapper._openai_generate, LLMWrapper._openai_stream
+))
+register_backend('anthropic', LLMBackend(
+    'anthropic', LLMWrapper._initialize_anthropic, LLMWrapper._anthropic_generate, LLMWrapper._anthropic_stream
+))
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from url_index import canonicalize_url
+
+class PageCache:
+    """Size-bounded on-disk cache of extracted pages.
+
+    Entries keep the extracted result (zlib-compressed JSON) together with the
+    response's ETag/Last-Modified validators. Within ttl an entry is served
+    as-is; after that the scraper revalidates it with a conditional GET and a
+    304 refreshes the entry without downloading or parsing the page again.
+    Keys are namespaced (by the scraper, with its extractor name) so results
+    of one extraction engine are never served to another.
+    """
+    def __init__(self, path="cache/pages.sqlite3", max_disk_bytes=128 * 1024 * 1024, ttl=24 * 3600, namespace=''):
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.namespace = namespace
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, data BLOB, etag TEXT, last_modified TEXT, "
+            "size INTEGER, fetched REAL, accessed REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+        self.conn.commit()
+        self.disk_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def lookup(self, url):
+        """Return the cached entry for url, or None.
+
+        The entry dict holds 'data', 'etag', 'last_modified' and 'fresh'. Fresh
+        entries count as hits; a stale one is returned for revalidation and is
+        counted once the conditional GET resolves.
+        """
+        key = self._key(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, etag, last_modified, fetched FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            data, etag, last_modified, fetched = row
+            fresh = now - fetched <= self.ttl
+            if fresh:
+                self.conn.execute("UPDATE pages SET accessed = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.stats['hits'] += 1
+            elif not (etag or last_modified):
+                # Nothing to revalidate with, so the page has to be fetched in full
+                self._delete(key)
+                self.conn.commit()
+                self.stats['misses'] += 1
+                return None
+        return {
+            'data': json.loads(zlib.decompress(data).decode('utf-8')),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': fresh
+        }
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url, etag=None, last_modified=None):
+        """Record a 304 for url: the entry is fresh again for another ttl"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE pages SET fetched = ?, accessed = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, etag, last_modified, self._key(url))
+            )
+            self.conn.commit()
+            self.stats['revalidated'] += 1
+
+    def store(self, url, data, etag=None, last_modified=None, stale=False):
+        """Store an extracted page. stale=True marks a full refetch of an expired entry as a miss."""
+        key = self._key(url)
+        blob = zlib.compress(json.dumps(data).encode('utf-8'))
+        now = time.time()
+        with self.lock:
+            if stale:
+                self.stats['misses'] += 1
+            self._delete(key)
+            self.conn.execute(
+                "INSERT INTO pages (key, data, etag, last_modified, size, fetched, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, etag, last_modified, len(blob), now, now)
+            )
+            self.disk_bytes += len(blob)
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['disk_bytes'] = self.disk_bytes
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _key(self, url):
+        return f"{self.namespace} {canonicalize_url(url)}" if self.namespace else canonicalize_url(url)
+
+    def _delete(self, key):
+        row = self.conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self.disk_bytes -= row[0]
+
+    def _evict(self):
+        """Drop least recently used pages until the store fits in max_disk_bytes"""
+        while self.disk_bytes > self.max_disk_bytes:
+            row = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                self.disk_bytes = 0
+                break
+            self.conn.execute("DELETE FROM pages WHERE key = ?", (row[0],))
+            self.disk_bytes -= row[1]
+            self.stats['evictions'] += 1
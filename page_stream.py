@@ -0,0 +1,116 @@
+import re
+import codecs
+from html.parser import HTMLParser
+from html_extractors import MAX_CONTENT_CHARS, UNWANTED_TAGS
+
+ACCEPTED_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+CHUNK_BYTES = 16 * 1024
+# Tags that end an implicitly closed <p>
+BLOCK_TAGS = {'div', 'section', 'ul', 'ol', 'table', 'pre', 'blockquote', 'form',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'main', 'article', 'aside'}
+CHARSET_HEADER = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+CHARSET_META = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.I)
+
+def is_accepted_content_type(content_type):
+    """True for HTML and plain text; a missing Content-Type is given the benefit of the doubt"""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return not media_type or media_type in ACCEPTED_CONTENT_TYPES
+
+def sniff_encoding(content_type, head):
+    """Charset from the Content-Type header, else from a <meta> tag in the first chunk, else UTF-8"""
+    match = CHARSET_HEADER.search(content_type) or CHARSET_META.search(head[:4096])
+    if match:
+        encoding = match.group(1)
+        encoding = encoding.decode('ascii', 'ignore') if isinstance(encoding, bytes) else encoding
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+class ContentBudgetParser(HTMLParser):
+    """Counts paragraph text as HTML streams in, mirroring what the extractors keep.
+
+    Paragraphs inside <main>/<article> count once one of those has opened,
+    otherwise all paragraphs outside script/style/nav/header/footer do.
+    """
+    def __init__(self, budget):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.skip_depth = 0
+        self.main_depth = 0
+        self.main_seen = False
+        self.in_paragraph = False
+        self.main_chars = 0
+        self.page_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in UNWANTED_TAGS:
+            self.skip_depth += 1
+        elif tag == 'p':
+            self.in_paragraph = True
+        elif tag in BLOCK_TAGS:
+            self.in_paragraph = False
+        if tag in ('main', 'article'):
+            self.main_depth += 1
+            self.main_seen = True
+
+    def handle_endtag(self, tag):
+        if tag in UNWANTED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag == 'p' or tag in BLOCK_TAGS:
+            self.in_paragraph = False
+        if tag in ('main', 'article') and self.main_depth:
+            self.main_depth -= 1
+
+    def handle_data(self, data):
+        if self.in_paragraph and not self.skip_depth:
+            chars = len(data.strip())
+            self.page_chars += chars
+            if self.main_depth:
+                self.main_chars += chars
+
+    @property
+    def filled(self):
+        return (self.main_chars if self.main_seen else self.page_chars) >= self.budget
+
+class PageReader:
+    """Decodes a streamed response body and decides when enough of it has been read.
+
+    Reading stops at max_bytes, or, when content_budget is set, as soon as
+    the HTML seen so far holds that many characters of paragraph text.
+    """
+    def __init__(self, content_type, max_bytes, content_budget=MAX_CONTENT_CHARS):
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        is_html = content_type.split(';', 1)[0].strip().lower() != 'text/plain'
+        self.parser = ContentBudgetParser(content_budget) if content_budget and is_html else None
+        self.decoder = None
+        self.parts = []
+        self.bytes_read = 0
+        self.truncated = False
+        self.stopped_early = False
+
+    def feed(self, chunk):
+        """Add a body chunk; returns True once reading should stop"""
+        if self.decoder is None:
+            self.decoder = codecs.getincrementaldecoder(sniff_encoding(self.content_type, chunk))(errors='replace')
+        if self.bytes_read + len(chunk) >= self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        text = self.decoder.decode(chunk)
+        self.parts.append(text)
+        if self.truncated:
+            return True
+        if self.parser:
+            self.parser.feed(text)
+            if self.parser.filled:
+                self.stopped_early = True
+                return True
+        return False
+
+    def text(self):
+        if self.decoder is None:
+            return ''
+        return ''.join(self.parts) + self.decoder.decode(b'', final=True)
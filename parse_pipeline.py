@@ -0,0 +1,117 @@
+import time
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from html_extractors import get_extractor
+from llm_config import get_scraper_config
+
+logger = logging.getLogger(__name__)
+
+def extract_page(extractor_name, html, url):
+    """Runs in a pool process: extract one page and report how long it took"""
+    start = time.perf_counter()
+    data = get_extractor(extractor_name)(html, url)
+    return data, time.perf_counter() - start
+
+class ParsePipeline:
+    """Process pool that extracts pages handed over by the fetch threads.
+
+    Fetchers submit decoded HTML (pickled to the worker) and go straight back
+    to the network. At most max_pending pages may wait for or be in
+    extraction; beyond that submit() blocks, holding fetchers back until the
+    parsers catch up.
+    """
+    def __init__(self, extractor_name, workers, max_pending=None):
+        self.extractor_name = extractor_name
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        self.lock = threading.Lock()
+        self.started = None
+        self.stats = {
+            'fetch': {'pages': 0, 'busy_seconds': 0.0},
+            'parse': {'pages': 0, 'busy_seconds': 0.0, 'failed': 0},
+            'backpressure_waits': 0,
+            'backpressure_seconds': 0.0,
+            'pending': 0
+        }
+
+    def record_fetch(self, seconds):
+        with self.lock:
+            self.stats['fetch']['pages'] += 1
+            self.stats['fetch']['busy_seconds'] += seconds
+
+    def submit(self, html, url):
+        """Queue a page for extraction and return a Future of its data dict"""
+        if not self.slots.acquire(blocking=False):
+            start = time.perf_counter()
+            self.slots.acquire()
+            with self.lock:
+                self.stats['backpressure_waits'] += 1
+                self.stats['backpressure_seconds'] += time.perf_counter() - start
+        with self.lock:
+            if self.started is None:
+                self.started = time.perf_counter()
+            self.stats['pending'] += 1
+        try:
+            job = self.executor.submit(extract_page, self.extractor_name, html, url)
+        except Exception:
+            self._release()
+            raise
+        job.add_done_callback(self._job_done)
+        return job
+
+    def _job_done(self, job):
+        self._release()
+        with self.lock:
+            if job.cancelled() or job.exception() is not None:
+                self.stats['parse']['failed'] += 1
+                return
+            self.stats['parse']['pages'] += 1
+            self.stats['parse']['busy_seconds'] += job.result()[1]
+
+    def _release(self):
+        with self.lock:
+            self.stats['pending'] -= 1
+        self.slots.release()
+
+    def get_metrics(self):
+        with self.lock:
+            metrics = {
+                'fetch': dict(self.stats['fetch']),
+                'parse': dict(self.stats['parse']),
+                'backpressure_waits': self.stats['backpressure_waits'],
+                'backpressure_seconds': round(self.stats['backpressure_seconds'], 3),
+                'pending': self.stats['pending'],
+                'parse_workers': self.workers
+            }
+            elapsed = time.perf_counter() - self.started if self.started else 0.0
+        for stage in ('fetch', 'parse'):
+            pages, busy = metrics[stage]['pages'], metrics[stage]['busy_seconds']
+            metrics[stage]['busy_seconds'] = round(busy, 3)
+            # Per busy second is what one worker sustains; per wall second is what the stage delivered
+            metrics[stage]['pages_per_busy_second'] = round(pages / busy, 1) if busy else 0.0
+            metrics[stage]['pages_per_second'] = round(pages / elapsed, 1) if elapsed else 0.0
+        return metrics
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+_shared_pipeline = None
+_shared_pipeline_lock = threading.Lock()
+
+def get_parse_pipeline():
+    """Return the process-wide ParsePipeline, or None when parse_workers is 0 (parse inline)"""
+    global _shared_pipeline
+    config = get_scraper_config()
+    workers = config.get('parse_workers', 0)
+    if not workers:
+        return None
+    with _shared_pipeline_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = ParsePipeline(
+                config.get('extractor', 'html.parser'),
+                workers,
+                max_pending=config.get('parse_queue_size')
+            )
+        return _shared_pipeline
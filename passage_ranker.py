@@ -0,0 +1,93 @@
+import re
+import math
+from collections import Counter
+from token_counter import TokenCounter
+
+PASSAGE_CHARS = 500
+TOKEN = re.compile(r'\w+')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+STOP_WORDS = {
+    'the', 'be', 'to', 'of', 'and', 'a', 'an', 'in', 'that', 'have', 'i', 'it', 'for', 'not', 'on',
+    'with', 'he', 'as', 'you', 'do', 'at', 'is', 'are', 'was', 'were', 'this', 'by', 'or', 'from',
+    'what', 'how', 'why', 'which', 'who', 'when', 'where', 'does', 'can'
+}
+
+def tokenize(text):
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+def split_passages(blocks, passage_chars=PASSAGE_CHARS, max_chars=None):
+    """Cut text blocks (paragraphs) into passages of about passage_chars.
+
+    Short neighbouring blocks are merged and long ones are split at sentence
+    ends, so passages are comparable in length. Stops after max_chars of text.
+    """
+    passages = []
+    current = ''
+    total = 0
+    for block in blocks:
+        block = ' '.join(block.split())
+        if not block:
+            continue
+        pieces = SENTENCE_END.split(block) if len(block) > passage_chars else [block]
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > passage_chars:
+                passages.append(current)
+                total += len(current)
+                current = ''
+                if max_chars and total >= max_chars:
+                    return passages
+            # A single sentence longer than a passage is hard-wrapped
+            while len(piece) > passage_chars:
+                passages.append(piece[:passage_chars])
+                total += passage_chars
+                piece = piece[passage_chars:]
+                if max_chars and total >= max_chars:
+                    return passages
+            current = f"{current} {piece}" if current else piece
+    if current:
+        passages.append(current)
+    return passages
+
+def bm25_scores(passages, query, k1=1.5, b=0.75):
+    """Okapi BM25 score of each passage for query, with the page's passages as the corpus"""
+    query_terms = set(tokenize(query))
+    if not query_terms or not passages:
+        return [0.0] * len(passages)
+    term_counts = [Counter(tokenize(passage)) for passage in passages]
+    lengths = [sum(counts.values()) for counts in term_counts]
+    avg_length = sum(lengths) / len(lengths) or 1.0
+    document_frequency = Counter(term for counts in term_counts for term in query_terms & counts.keys())
+    idf = {
+        term: math.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+        for term, df in document_frequency.items()
+    }
+    scores = []
+    for counts, length in zip(term_counts, lengths):
+        norm = k1 * (1 - b + b * length / avg_length)
+        scores.append(sum(
+            weight * counts[term] * (k1 + 1) / (counts[term] + norm)
+            for term, weight in idf.items() if term in counts
+        ))
+    return scores
+
+def select_passages(passages, query, max_chars, max_tokens=None, count_tokens=None):
+    """Join the best-scoring passages that fit the budget, in page order.
+
+    Passages are taken by descending score; unscored passages follow in page
+    order, so a page with no match degrades to its leading text. Tokens are
+    counted with count_tokens (normally TokenCounter.count), or TokenCounter's
+    heuristic when none is given.
+    """
+    count_tokens = count_tokens or TokenCounter._estimate
+    scores = bm25_scores(passages, query)
+    order = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    chosen = []
+    chars = tokens = 0
+    for i in order:
+        passage_tokens = count_tokens(passages[i]) if max_tokens else 0
+        if chars + len(passages[i]) > max_chars or (max_tokens and tokens + passage_tokens > max_tokens):
+            continue
+        chosen.append(i)
+        chars += len(passages[i]) + 1
+        tokens += passage_tokens
+    return ' '.join(passages[i] for i in sorted(chosen))
@@ -0,0 +1,101 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+
+class DomainRateLimiter:
+    """Thread-safe per-domain token buckets with adaptive slowdown.
+
+    Each domain refills at `rate` tokens per second up to `burst` tokens.
+    A 429/503 response halves the domain's rate (down to min_rate) and blocks
+    it until Retry-After has passed; successful requests recover the rate
+    gradually back to the configured value.
+    """
+    def __init__(self, rate=1.0, burst=1, min_rate=0.05, recovery=1.25):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.stats = {'acquired': 0, 'deferred': 0, 'throttled_responses': 0}
+
+    def try_acquire(self, domain):
+        """Take a token without blocking. Returns 0.0 on success, otherwise seconds until one is due."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self._bucket(domain, now)
+            self._refill(bucket, now)
+            if now < bucket['blocked_until']:
+                self.stats['deferred'] += 1
+                return bucket['blocked_until'] - now
+            if bucket['tokens'] >= 1:
+                bucket['tokens'] -= 1
+                self.stats['acquired'] += 1
+                return 0.0
+            self.stats['deferred'] += 1
+            return (1 - bucket['tokens']) / bucket['rate']
+
+    def acquire(self, domain, deadline=None):
+        """Block until a token is available. Returns False if that would pass the time.time() deadline."""
+        while True:
+            wait = self.try_acquire(domain)
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.time() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def record_success(self, domain):
+        with self.lock:
+            bucket = self.buckets.get(domain)
+            if bucket and bucket['rate'] < self.rate:
+                bucket['rate'] = min(self.rate, bucket['rate'] * self.recovery)
+
+    def record_throttled(self, domain, retry_after=None):
+        """Slow a domain down after a 429/503, honouring a Retry-After header value if given"""
+        now = time.monotonic()
+        delay = parse_retry_after(retry_after)
+        with self.lock:
+            bucket = self._bucket(domain, now)
+            self._refill(bucket, now)
+            bucket['rate'] = max(self.min_rate, bucket['rate'] / 2)
+            bucket['tokens'] = 0.0
+            if delay is None:
+                delay = 1 / bucket['rate']
+            bucket['blocked_until'] = max(bucket['blocked_until'], now + delay)
+            self.stats['throttled_responses'] += 1
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['domains'] = len(self.buckets)
+            stats['slowed_domains'] = {
+                domain: round(bucket['rate'], 3)
+                for domain, bucket in self.buckets.items() if bucket['rate'] < self.rate
+            }
+        return stats
+
+    def _bucket(self, domain, now):
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            bucket = {'tokens': float(self.burst), 'rate': self.rate, 'updated': now, 'blocked_until': 0.0}
+            self.buckets[domain] = bucket
+        return bucket
+
+    def _refill(self, bucket, now):
+        elapsed = now - bucket['updated']
+        bucket['tokens'] = min(float(self.burst), bucket['tokens'] + elapsed * bucket['rate'])
+        bucket['updated'] = now
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
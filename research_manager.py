@@ -19,6 +19,14 @@ import tty
 from threading import Event
 from urllib.parse import urlparse
 from pathlib import Path
+from llm_wrapper import CachedPrompt
+from llm_scheduler import PRIORITY_INTERACTIVE
+from token_counter import TokenCounter
+from content_dedup import SimHashIndex
+from url_index import SeenUrlStore, canonicalize_url
+from link_frontier import LinkFrontier
+from search_cache import get_search_stats
+from llm_config import get_url_index_config, get_link_frontier_config
 
 # Initialize colorama for cross-platform color support
 if os.name == 'nt':  # Windows-specific initialization
@@ -84,7 +92,7 @@ class StrategicAnalysisParser:
             ]
         }
 
-    def strategic_analysis(self, original_query: str) -> Optional[AnalysisResult]:
+    def strategic_analysis(self, original_query: str, use_cache: bool = True) -> Optional[AnalysisResult]:
         """Generate and process research areas with retries until success"""
         max_retries = 3
         try:
@@ -113,7 +121,8 @@ Priority: [number 1-5]
 Priority: [number 1-5]
 """
             for attempt in range(max_retries):
-                response = self.llm.generate(prompt, max_tokens=1000)
+                # Retries must bypass the cache or they would replay the rejected response
+                response = self.llm.generate(prompt, max_tokens=1000, use_cache=use_cache and attempt == 0)
                 focus_areas = self._extract_research_areas(response)
 
                 if focus_areas:  # If we got any valid areas
@@ -132,7 +141,7 @@ Priority: [number 1-5]
 
             # If all retries failed, try one final time with a stronger prompt
             prompt += "\n\nIMPORTANT: You MUST provide exactly 5 research areas with priorities. This is crucial."
-            response = self.llm.generate(prompt, max_tokens=1000)
+            response = self.llm.generate(prompt, max_tokens=1000, use_cache=False)
             focus_areas = self._extract_research_areas(response)
 
             if focus_areas:
@@ -604,8 +613,12 @@ class ResearchManager:
             'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at'
         }
 
-        # State tracking
+        # State tracking; searched_urls holds canonical urls researched this session
         self.searched_urls: Set[str] = set()
+        self.url_index = self._initialize_url_index()
+        self.url_scope = ''
+        self.previously_researched = 0
+        self.skipped_previously_researched = 0
         self.current_focus: Optional[ResearchFocus] = None
         self.original_query: str = ""
         self.focus_areas: List[ResearchFocus] = []
@@ -621,6 +634,18 @@ class ResearchManager:
         self.document_path = None
         self.session_files = []
 
+        # Running token count of the session document, maintained as content is appended
+        self.token_counter = TokenCounter(self.llm)
+        self.document_tokens = 0
+
+        # Fingerprints of the content in the document, to keep near-duplicate pages out
+        self.content_index = SimHashIndex()
+        self.duplicate_sources: Dict[str, List[str]] = {}
+        self.duplicate_tokens_saved = 0
+
+        # Outbound links of scraped pages, followed without a search round trip when enabled
+        self.link_frontier: Optional[LinkFrontier] = None
+
         # Initialize UI and parser
         self.ui = TerminalUI()
         self.strategic_parser = StrategicAnalysisParser(llm=self.llm)
@@ -663,12 +688,9 @@ class ResearchManager:
 
         return " ".join(lines).strip()
 
-    def formulate_search_queries(self, focus_area: ResearchFocus) -> List[str]:
-        """Generate search queries for a focus area"""
-        try:
-            self.print_thinking()
-
-            prompt = f"""
+    def _search_query_prompt(self, focus_area: ResearchFocus) -> str:
+        """Build the query formulation prompt for a focus area"""
+        return f"""
 In order to research this query/topic:
 
 Context: {self.original_query}
@@ -685,8 +707,11 @@ Time range: [d/w/m/y/none]
 
 Do not provide any additional information or explanation, note that the time range allows you to see results within a time range (d is within the last day, w is within the last week, m is within the last month, y is within the last year, and none is results from anytime, only select one, using only the corresponding letter for whichever of these options you select as indicated in the response format) use your judgement as many searches will not require a time range and some may depending on what the research focus is.
 """
-            response_text = self.llm.generate(prompt, max_tokens=50, stop=None)
-            query, time_range = self.parse_query_response(response_text)
+
+    def _queries_from_response(self, focus_area: ResearchFocus, response_text: str) -> List[str]:
+        """Turn a query formulation response into the list of queries to run"""
+        try:
+            query, time_range = self.search_engine.parse_query_response(response_text)
 
             if not query:
                 self.ui.update_output(f"{Fore.RED}Error: Empty search query. Using focus area as query...{Style.RESET_ALL}")
@@ -702,6 +727,39 @@ Do not provide any additional information or explanation, note that the time ran
             logger.error(f"Error formulating query: {str(e)}")
             return [focus_area.area]
 
+    def formulate_search_queries(self, focus_area: ResearchFocus) -> List[str]:
+        """Generate search queries for a focus area"""
+        try:
+            self.print_thinking()
+            response_text = self.llm.generate(self._search_query_prompt(focus_area), max_tokens=50, stop=None)
+            return self._queries_from_response(focus_area, response_text)
+
+        except Exception as e:
+            logger.error(f"Error formulating query: {str(e)}")
+            return [focus_area.area]
+
+    def prefetch_query_responses(self, focus_areas: List[ResearchFocus]) -> Dict[str, str]:
+        """Run query formulation for all focus areas as one LLM batch.
+
+        Returns the raw LLM response per focus area; areas whose request failed
+        are left out so the caller can fall back to formulate_search_queries.
+        """
+        try:
+            self.print_thinking()
+            prompts = [self._search_query_prompt(focus_area) for focus_area in focus_areas]
+            responses = self.llm.generate_batch(prompts, max_tokens=50, stop=None)
+        except Exception as e:
+            logger.error(f"Error formulating queries concurrently: {str(e)}")
+            return {}
+
+        prepared = {}
+        for focus_area, response in zip(focus_areas, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Error formulating query for {focus_area.area}: {str(response)}")
+                continue
+            prepared[focus_area.area] = response
+        return prepared
+
     def parse_search_query(self, query_response: str) -> Dict[str, str]:
         """Parse search query formulation response with improved time range detection"""
         try:
@@ -779,6 +837,14 @@ Do not provide any additional information or explanation, note that the time ran
 
     def _initialize_document(self):
         """Initialize research session document"""
+        self.content_index = SimHashIndex()
+        self.duplicate_sources = {}
+        self.duplicate_tokens_saved = 0
+        scope = get_url_index_config().get('scope', 'topic')
+        self.url_scope = SeenUrlStore.make_scope(self.original_query) if scope == 'topic' else ''
+        self.skipped_previously_researched = 0
+        self.previously_researched = self.url_index.count(self.url_scope) if self._skips_previous_sessions() else 0
+        self.link_frontier = self._initialize_link_frontier()
         try:
             # Get all existing research session files
             self.session_files = []
@@ -795,36 +861,141 @@ Do not provide any additional information or explanation, note that the time ran
             self.document_path = f"research_session_{next_session}.txt"
 
             # Initialize the new document
+            header = (
+                f"Research Session {next_session}\n"
+                f"Topic: {self.original_query}\n"
+                f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                + "="*80 + "\n\n"
+            )
             with open(self.document_path, 'w', encoding='utf-8') as f:
-                f.write(f"Research Session {next_session}\n")
-                f.write(f"Topic: {self.original_query}\n")
-                f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("="*80 + "\n\n")
+                f.write(header)
                 f.flush()
+            self.document_tokens = self.token_counter.count(header)
 
         except Exception as e:
             logger.error(f"Error initializing document: {str(e)}")
             self.document_path = "research_findings.txt"
+            header = "Research Findings:\n\n"
             with open(self.document_path, 'w', encoding='utf-8') as f:
-                f.write("Research Findings:\n\n")
+                f.write(header)
                 f.flush()
+            self.document_tokens = self.token_counter.count(header)
 
-    def add_to_document(self, content: str, source_url: str, focus_area: str):
-        """Add research findings to current session document"""
+    def add_to_document(self, content: str, source_url: str, focus_area: str) -> bool:
+        """Add research findings to current session document; True if the page was added"""
         try:
+            if self._is_known_url(source_url):
+                return False
+            if self._is_near_duplicate(content, source_url):
+                return False
             with open(self.document_path, 'a', encoding='utf-8') as f:
-                if source_url not in self.searched_urls:
-                    f.write(f"\n{'='*80}\n")
-                    f.write(f"Research Focus: {focus_area}\n")
-                    f.write(f"Source: {source_url}\n")
-                    f.write(f"Content:\n{content}\n")
-                    f.write(f"{'='*80}\n")
-                    f.flush()
-                    self.searched_urls.add(source_url)
-                    self.ui.update_output(f"Added content from: {source_url}")
+                entry = (
+                    f"\n{'='*80}\n"
+                    f"Research Focus: {focus_area}\n"
+                    f"Source: {source_url}\n"
+                    f"Content:\n{content}\n"
+                    f"{'='*80}\n"
+                )
+                f.write(entry)
+                f.flush()
+            self.document_tokens += self.token_counter.count(entry)
+            self._mark_url_seen(source_url)
+            self.ui.update_output(f"Added content from: {source_url}")
+            return True
         except Exception as e:
             logger.error(f"Error adding to document: {str(e)}")
             self.ui.update_output(f"Error saving content: {str(e)}")
+        return False
+
+    def _is_near_duplicate(self, content: str, source_url: str) -> bool:
+        """Skip content that near-duplicates a page already in the document (mirrors, syndication)"""
+        original = self.content_index.check(source_url, content)
+        if not original:
+            return False
+        self._mark_url_seen(source_url)
+        self.duplicate_sources.setdefault(original, []).append(source_url)
+        saved = self.token_counter.count(content)
+        self.duplicate_tokens_saved += saved
+        self.ui.update_output(f"Skipped near-duplicate of {original}: {source_url} (~{saved} tokens saved)")
+        return True
+
+    def _initialize_url_index(self) -> Optional[SeenUrlStore]:
+        config = get_url_index_config()
+        if not config.get('enabled', False):
+            return None
+        try:
+            return SeenUrlStore(
+                path=config.get('path', 'cache/seen_urls.sqlite3'),
+                memory_entries=config.get('memory_entries', 10000)
+            )
+        except Exception as e:
+            logger.error(f"Error opening seen-URL index: {str(e)}")
+            return None
+
+    def _skips_previous_sessions(self) -> bool:
+        return bool(self.url_index) and get_url_index_config().get('skip_previous_sessions', True)
+
+    def _is_known_url(self, url: str) -> bool:
+        """True if the page was researched this session or, per the url index, in an earlier one"""
+        if canonicalize_url(url) in self.searched_urls:
+            return True
+        return self._skips_previous_sessions() and self.url_index.seen(url, self.url_scope)
+
+    def _mark_url_seen(self, url: str):
+        self.searched_urls.add(canonicalize_url(url))
+        if self.url_index:
+            self.url_index.add(url, self.url_scope, source=self.document_path or '')
+
+    def _filter_known_results(self, results: List[Dict]) -> List[Dict]:
+        """Drop search results that were already researched, renumbering the rest for selection"""
+        fresh = []
+        earlier = 0
+        for result in results:
+            if canonicalize_url(result['href']) in self.searched_urls:
+                continue
+            if self._is_known_url(result['href']):
+                earlier += 1
+                continue
+            fresh.append(result)
+        if earlier:
+            self.skipped_previously_researched += earlier
+            self.ui.update_output(f"Skipped {earlier} result(s) already researched in an earlier session")
+        if len(fresh) < len(results):
+            logger.info(f"Skipping {len(results) - len(fresh)} already researched results")
+        return [{**result, 'number': i + 1} for i, result in enumerate(fresh)]
+
+    def _initialize_link_frontier(self) -> Optional[LinkFrontier]:
+        config = get_link_frontier_config()
+        if not config.get('enabled', False):
+            return None
+        return LinkFrontier(
+            max_depth=config.get('max_depth', 1),
+            max_per_domain=config.get('max_per_domain', 3),
+            max_size=config.get('max_size', 500),
+            stop_words=self.stop_words
+        )
+
+    def _add_scraped_pages(self, pages: Dict[str, Dict], focus_area: str, depth: int = 0):
+        """Store scraped pages and queue the outbound links of those added to the document"""
+        for url, page in pages.items():
+            # Known pages and near-duplicates are left out of the document, so their links are not followed
+            if self.add_to_document(page['content'], url, focus_area) and self.link_frontier:
+                self.link_frontier.add_page(url, page.get('anchors', []), depth)
+
+    def _follow_frontier_links(self, focus_area: ResearchFocus):
+        """Scrape the best frontier links for the focus area; no search or LLM selection is involved"""
+        if not self.link_frontier:
+            return
+        count = get_link_frontier_config().get('pages_per_focus', 2)
+        depths = dict(self.link_frontier.pop(count, is_known=self._is_known_url))
+        if not depths:
+            return
+        self.ui.update_output(f"\n⚙️ Following {len(depths)} linked page(s)...")
+        # scrape_pages applies the robots.txt check
+        for url, page in self.search_engine.scrape_pages(
+            list(depths), focus_area.area, count_tokens=self.token_counter.count
+        ).items():
+            self._add_scraped_pages({url: page}, focus_area.area, depths[url])
 
     def _process_search_results(self, results: Dict[str, str], focus_area: str):
         """Process and store search results"""
@@ -832,12 +1003,13 @@ Do not provide any additional information or explanation, note that the time ran
             return
 
         for url, content in results.items():
-            if url not in self.searched_urls:
+            if not self._is_known_url(url):
                 self.add_to_document(content, url, focus_area)
 
     def _research_loop(self):
         """Main research loop with comprehensive functionality"""
         self.is_running = True
+        cycle = 0
         try:
             self.research_started.set()
 
@@ -851,7 +1023,9 @@ Do not provide any additional information or explanation, note that the time ran
 
                 # Generate focus areas
                 self.ui.update_output("\nGenerating research focus areas...")
-                analysis_result = self.strategic_parser.strategic_analysis(self.original_query)
+                # Only the first cycle may reuse cached areas; later cycles need fresh ones
+                analysis_result = self.strategic_parser.strategic_analysis(self.original_query, use_cache=cycle == 0)
+                cycle += 1
 
                 if not analysis_result:
                     self.ui.update_output("\nFailed to generate analysis result. Retrying...")
@@ -867,6 +1041,9 @@ Do not provide any additional information or explanation, note that the time ran
                     self.ui.update_output(f"\nArea {i}: {focus.area}")
                     self.ui.update_output(f"Priority: {focus.priority}")
 
+                # Formulate queries for every focus area up front, in one LLM batch
+                query_responses = self.prefetch_query_responses(focus_areas)
+
                 # Process each focus area in priority order
                 for focus_area in focus_areas:
                     if self.should_terminate.is_set():
@@ -881,8 +1058,13 @@ Do not provide any additional information or explanation, note that the time ran
 
                     self.current_focus = focus_area
                     self.ui.update_output(f"\nInvestigating: {focus_area.area}")
+                    if self.link_frontier:
+                        self.link_frontier.set_focus(focus_area.area)
 
-                    queries = self.formulate_search_queries(focus_area)
+                    if focus_area.area in query_responses:
+                        queries = self._queries_from_response(focus_area, query_responses[focus_area.area])
+                    else:
+                        queries = self.formulate_search_queries(focus_area)
                     if not queries:
                         continue
 
@@ -900,6 +1082,11 @@ Do not provide any additional information or explanation, note that the time ran
                         try:
                             self.ui.update_output(f"\nSearching: {query}")
                             results = self.search_engine.perform_search(query, time_range='none')
+                            # Pages researched before are neither offered to the LLM nor fetched again
+                            new_results = self._filter_known_results(results) if results else []
+                            if results and not new_results:
+                                self.ui.update_output("All results for this query were already researched.")
+                            results = new_results
 
                             if results:
                                 # self.search_engine.display_search_results(results)
@@ -907,16 +1094,20 @@ Do not provide any additional information or explanation, note that the time ran
 
                                 if selected_urls:
                                     self.ui.update_output("\n⚙️ Scraping selected pages...")
-                                    scraped_content = self.search_engine.scrape_content(selected_urls)
-                                    if scraped_content:
-                                        for url, content in scraped_content.items():
-                                            if url not in self.searched_urls:
-                                                self.add_to_document(content, url, focus_area.area)
+                                    scraped_pages = self.search_engine.scrape_pages(
+                                        selected_urls, query, count_tokens=self.token_counter.count
+                                    )
+                                    self._add_scraped_pages(scraped_pages, focus_area.area)
 
                         except Exception as e:
                             logger.error(f"Error in search: {str(e)}")
                             self.ui.update_output(f"Error during search: {str(e)}")
 
+                    try:
+                        self._follow_frontier_links(focus_area)
+                    except Exception as e:
+                        logger.error(f"Error following frontier links: {str(e)}")
+
                     if self.check_document_size():
                         self.ui.update_output("\nDocument size limit reached. Finalizing research.")
                         return
@@ -939,6 +1130,11 @@ Do not provide any additional information or explanation, note that the time ran
 
             self.ui.update_output(f"Starting research on: {topic}")
             self.ui.update_output(f"Session document: {self.document_path}")
+            if self.previously_researched:
+                self.ui.update_output(
+                    f"{self.previously_researched} page(s) were researched for this topic in earlier sessions "
+                    "and will be skipped (set URL_INDEX_CONFIG['skip_previous_sessions'] = False to include them)"
+                )
             self.ui.update_output("\nCommands available during research:")
             self.ui.update_output("'s' = Show status")
             self.ui.update_output("'f' = Show current focus")
@@ -967,8 +1163,8 @@ Do not provide any additional information or explanation, note that the time ran
                     if self.should_terminate.is_set() and not self.research_complete:
                         self.ui.update_output("\nGenerating research summary... please wait...")
                         summary = self.terminate_research()
-                        self.ui.update_output("\nFinal Research Summary:")
-                        self.ui.update_output(summary)
+                        if summary:
+                            self.ui.update_output(summary)
                     break
                 if cmd:
                     self._handle_command(cmd)
@@ -981,11 +1177,8 @@ Do not provide any additional information or explanation, note that the time ran
     def check_document_size(self) -> bool:
         """Check if document size is approaching context limit"""
         try:
-            with open(self.document_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            estimated_tokens = len(content.split()) * 1.3
             max_tokens = self.llm.llm_config.get('n_ctx', 2048)
-            current_ratio = estimated_tokens / max_tokens
+            current_ratio = self.document_tokens / max_tokens
 
             if current_ratio > 0.8:
                 logger.warning(f"Document size at {current_ratio*100:.1f}% of context limit")
@@ -1014,8 +1207,8 @@ Do not provide any additional information or explanation, note that the time ran
             self.should_terminate.set()
             self.ui.update_output("\nGenerating research summary... please wait...")
             summary = self.terminate_research()
-            self.ui.update_output("\nFinal Research Summary:")
-            self.ui.update_output(summary)
+            if summary:
+                self.ui.update_output(summary)
 
     def pause_and_assess(self):
         """Pause the research and assess if the collected content is sufficient."""
@@ -1051,23 +1244,24 @@ Do not provide any additional information or explanation, note that the time ran
                 self.research_paused = False
                 return
 
-            # Prepare the prompt for the AI assessment
-            assessment_prompt = f"""
+            # Prepare the prompt for the AI assessment; the research content is the cacheable prefix
+            assessment_prompt = CachedPrompt(prefix=f"""
 Based on the following research content, please assess whether the original query "{self.original_query}" can be answered sufficiently with the collected information.
 
 Research Content:
 {content}
-
+""", suffix="""
 Instructions:
 1. If the research content provides enough information to answer the original query in detail, respond with: "The research is sufficient to answer the query."
 2. If not, respond with: "The research is insufficient and it would be advisable to continue gathering information."
 3. Do not provide any additional information or details.
 
 Assessment:
-"""
+""")
 
             # Generate the assessment
-            assessment = self.llm.generate(assessment_prompt, max_tokens=200)
+            # The user is waiting on this, so it goes ahead of queued research calls
+            assessment = self.llm.generate(assessment_prompt, max_tokens=200, priority=PRIORITY_INTERACTIVE)
 
             # Stop the progress indicator
             self.summary_ready = True
@@ -1095,8 +1289,8 @@ Assessment:
                     self.awaiting_user_decision = False
                     self.should_terminate.set()
                     summary = self.terminate_research()
-                    self.ui.update_output("\nFinal Research Summary:")
-                    self.ui.update_output(summary)
+                    if summary:
+                        self.ui.update_output(summary)
                     break
                 else:
                     self.ui.update_output("Invalid command. Please enter 'c' to continue or 'q' to quit.")
@@ -1110,21 +1304,65 @@ Assessment:
 
     def get_progress(self) -> str:
         """Get current research progress"""
+        search_stats = get_search_stats()
+        searches = (
+            f"\n- Searches sent: {search_stats['searches']} "
+            f"(~{search_stats['seconds_saved']:.1f}s saved by cached or shared results)"
+            if search_stats else ""
+        )
         return f"""
 Research Progress:
 - Original Query: {self.original_query}
 - Sources analyzed: {len(self.searched_urls)}
+- Results skipped as researched in earlier sessions: {self.skipped_previously_researched}
+- Near-duplicates skipped: {sum(len(urls) for urls in self.duplicate_sources.values())} (~{self.duplicate_tokens_saved} tokens saved)
+- Linked pages followed: {self.link_frontier.get_stats()['taken'] if self.link_frontier else 'off'}{searches}
 - Status: {'Active' if self.is_running else 'Stopped'}
 - Current focus: {self.current_focus.area if self.current_focus else 'Initializing'}
-"""
+{self._llm_metrics()}"""
+
+    def _llm_metrics(self) -> str:
+        """One progress line per LLM feature that has something to report"""
+        lines = []
+        scheduler = self.llm.get_scheduler_metrics()
+        lines.append(
+            f"- LLM requests: {scheduler['admitted']} "
+            f"(avg wait {scheduler['avg_wait_seconds']:.1f}s, {scheduler['queue_depth']} queued)"
+        )
+        batches = self.llm.get_batch_metrics()
+        if batches['batches']:
+            lines.append(
+                f"- LLM batches: {batches['batches']} ({batches['prompts']} prompts, "
+                f"last {batches['last_batch_size']} in {batches['last_batch_seconds']:.1f}s, "
+                f"{batches['throughput']:.2f} prompts/s)"
+            )
+        cache = self.llm.get_cache_stats()
+        if cache:
+            lines.append(f"- LLM response cache: {cache['hit_rate']:.0%} hit rate ({cache['bypassed']} sampled calls bypassed)")
+        prompt_cache = self.llm.get_prompt_cache_stats()
+        if prompt_cache['requests']:
+            lines.append(f"- Provider prompt cache: {prompt_cache['cached_ratio']:.0%} of input tokens cached")
+        connections = self.llm.get_connection_stats()
+        if connections:
+            lines.append(
+                f"- Ollama connections: {connections['reused_connections']} reused, "
+                f"{connections['new_connections']} opened"
+            )
+        return '\n'.join(lines) + '\n'
 
     def is_active(self) -> bool:
         """Check if research is currently active"""
         return self.is_running and self.research_thread and self.research_thread.is_alive()
 
     def terminate_research(self) -> str:
-        """Terminate research and return to main terminal"""
+        """Terminate research and return to main terminal.
+
+        A generated summary is streamed to the terminal as it arrives and an empty
+        string is returned; otherwise the returned message still has to be shown.
+        """
         try:
+            # Leave the curses research view first so the streamed summary stays on screen
+            self._cleanup_research_ui()
             print("Initiating research termination...")
             sys.stdout.flush()
 
@@ -1165,11 +1403,19 @@ Research Progress:
                 Summary:
                 """
 
-                summary = self.llm.generate(summary_prompt, max_tokens=4000)
+                def stop_indicator():
+                    self.summary_ready = True
+                    indicator_thread.join(timeout=1.0)
+
+                print(f"\n{Fore.GREEN}Research Summary:{Style.RESET_ALL}")
+                # Stream the summary so output appears as soon as the first token arrives
+                summary = self._stream_response(
+                    self.llm.generate_stream(summary_prompt, max_tokens=4000, priority=PRIORITY_INTERACTIVE),
+                    on_first_token=stop_indicator
+                )
 
                 # Signal that summary is complete to stop the progress indicator
-                self.summary_ready = True
-                indicator_thread.join(timeout=1.0)
+                stop_indicator()
 
                 # Store summary and mark research as complete
                 self.research_summary = summary
@@ -1195,11 +1441,8 @@ Research Progress:
                 with open(self.document_path, 'a', encoding='utf-8') as f:
                     f.write("\n\n" + formatted_summary)
 
-                # Clean up research UI
-                if hasattr(self, 'ui') and self.ui:
-                    self.ui.cleanup()
-
-                return formatted_summary
+                # The summary has already been shown as it streamed
+                return ""
 
             except Exception as e:
                 self.summary_ready = True
@@ -1215,6 +1458,24 @@ Research Progress:
             # Clean up research UI
             self._cleanup_research_ui()
 
+    def _stream_response(self, tokens, on_first_token=None) -> str:
+        """Print streamed tokens to the main terminal as they arrive and return the complete response"""
+        def notify_first(stream):
+            first = True
+            for token in stream:
+                if first and on_first_token:
+                    on_first_token()
+                first = False
+                yield token
+
+        parts = []
+        for token in notify_first(tokens):
+            parts.append(token)
+            sys.stdout.write(token)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
+        return ''.join(parts).strip()
+
     def show_progress_indicator(self, message="Generating summary, please wait..."):
         """Show a rotating progress indicator until the summary is ready."""
         symbols = ['|', '/', '-', '\\']
@@ -1287,17 +1548,24 @@ Research Progress:
                 thinking_thread.daemon = True
                 thinking_thread.start()
 
-                try:
-                    # Generate response
-                    response = self._generate_conversation_response(user_input)
-
+                def stop_thinking():
                     # Stop thinking indicator
                     self.thinking = False
                     thinking_thread.join()
 
                     # Display response in cyan
                     print(Fore.CYAN + "AI Response:" + Style.RESET_ALL)
-                    print(f"{Fore.CYAN}{response}{Style.RESET_ALL}\n")
+                    sys.stdout.write(Fore.CYAN)
+
+                try:
+                    # Stream response tokens as they are generated
+                    self._stream_response(
+                        self._stream_conversation_response(user_input),
+                        on_first_token=stop_thinking
+                    )
+                    self.thinking = False
+                    thinking_thread.join()
+                    print(Style.RESET_ALL)
                     print("-" * 80 + "\n")  # Separator between QA pairs
 
                 except Exception as e:
@@ -1314,6 +1582,10 @@ Research Progress:
 
     def _generate_conversation_response(self, user_query: str) -> str:
         """Generate contextual responses with improved context handling"""
+        return ''.join(self._stream_conversation_response(user_query)).strip()
+
+    def _stream_conversation_response(self, user_query: str):
+        """Yield response tokens for a conversation question as they are generated"""
         try:
             # Add debug logging to verify content
             logger.info(f"Research summary length: {len(self.research_summary) if self.research_summary else 0}")
@@ -1338,11 +1610,12 @@ Research Summary:
 {self.research_summary if self.research_summary else 'No summary available'}
 """
 
-            prompt = f"""
+            # The research context is identical on every turn, so it forms the cacheable prefix
+            prompt = CachedPrompt(prefix=f"""
 Based on the following research content and summary, please answer this question:
 
 {context}
-
+""", suffix=f"""
 Question: {user_query}
 
 you have 2 sets of instructions the applied set and the unapplied set, the applied set should be followed if the question is directly relating to the research content whereas anything else other then direct questions about the content of the research will result in you instead following the unapplied ruleset
@@ -1363,22 +1636,25 @@ Instructions:
 3. disregard rules in the applied set for queries not DIRECTLY related to the research, including queries about the research process or what you remember about the research should result in the unapplied ruleset being used.
 
 Answer:
-"""
+""")
 
-            response = self.llm.generate(
+            has_content = False
+            for token in self.llm.generate_stream(
                 prompt,
                 max_tokens=1000,  # Increased for more detailed responses
-                temperature=0.7
-            )
+                temperature=0.7,
+                priority=PRIORITY_INTERACTIVE
+            ):
+                if token.strip():
+                    has_content = True
+                yield token
 
-            if not response or not response.strip():
-                return "I apologize, but I cannot find relevant information in the research content to answer your question."
-
-            return response.strip()
+            if not has_content:
+                yield "I apologize, but I cannot find relevant information in the research content to answer your question."
 
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
-            return f"I apologize, but I encountered an error processing your question: {str(e)}"
+            yield f"I apologize, but I encountered an error processing your question: {str(e)}"
 
     def get_multiline_conversation_input(self) -> str:
         """Get multiline input with CTRL+D handling for conversation mode"""
@@ -1459,8 +1735,8 @@ if __name__ == "__main__":
                 topic = topic[1:]  # Remove @ prefix
                 manager.start_research(topic)
                 summary = manager.terminate_research()
-                print(f"\n{Fore.GREEN}Research Summary:{Style.RESET_ALL}")
-                print(summary)
+                if summary:
+                    print(summary)
                 print(f"\n{Fore.GREEN}Research completed. Ready for next topic.{Style.RESET_ALL}\n")
 
             except KeyboardInterrupt:
@@ -0,0 +1,112 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import requests
+
+logger = logging.getLogger(__name__)
+
+class RobotsCache:
+    """Per-domain robots.txt rules shared by every scrape.
+
+    Each origin's robots.txt is fetched once per ttl through the scraper's
+    pooled session. Outcomes follow urllib.robotparser: 401/403 disallow the
+    whole site, any other 4xx (no robots.txt) allows it, and those answers
+    are cached like a parsed file. Server errors and unreachable hosts
+    disallow for the shorter error_ttl. Threads asking for an origin that is
+    already being fetched wait for that fetch instead of starting another.
+    """
+    def __init__(self, session, user_agent, ttl=24 * 3600, error_ttl=300, timeout=5):
+        self.session = session
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.executor = None
+        self.stats = {'hits': 0, 'fetches': 0, 'coalesced': 0, 'errors': 0}
+
+    def can_fetch(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        return self._rules(f"{parsed.scheme}://{parsed.netloc}").can_fetch(self.user_agent, url)
+
+    def prefetch(self, urls):
+        """Start fetching robots.txt for every new origin in urls without waiting for the results"""
+        origins = {f"{p.scheme}://{p.netloc}" for p in map(urlparse, urls) if p.scheme in ('http', 'https')}
+        now = time.time()
+        with self.lock:
+            origins = [o for o in origins
+                       if o not in self.inflight and not (o in self.entries and self.entries[o][1] > now)]
+            if not origins:
+                return
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='robots')
+        for origin in origins:
+            self.executor.submit(self._rules, origin)
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['domains'] = len(self.entries)
+        return stats
+
+    def _rules(self, origin):
+        while True:
+            with self.lock:
+                entry = self.entries.get(origin)
+                if entry and entry[1] > time.time():
+                    self.stats['hits'] += 1
+                    return entry[0]
+                event = self.inflight.get(origin)
+                owner = event is None
+                if owner:
+                    event = self.inflight[origin] = threading.Event()
+                else:
+                    self.stats['coalesced'] += 1
+            if not owner:
+                # Re-check once the owner has stored its result (or given up)
+                event.wait(self.timeout + 1)
+                continue
+            try:
+                rules, ttl = self._fetch(origin)
+                with self.lock:
+                    self.entries[origin] = (rules, time.time() + ttl)
+                return rules
+            finally:
+                with self.lock:
+                    self.inflight.pop(origin, None)
+                event.set()
+
+    def _fetch(self, origin):
+        """Return (parser, ttl) for an origin's robots.txt"""
+        rules = RobotFileParser(f"{origin}/robots.txt")
+        with self.lock:
+            self.stats['fetches'] += 1
+        try:
+            response = self.session.get(f"{origin}/robots.txt", timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"Error reading robots.txt for {origin}: {e}")
+            with self.lock:
+                self.stats['errors'] += 1
+            rules.disallow_all = True
+            return rules, self.error_ttl
+
+        if response.status_code in (401, 403):
+            rules.disallow_all = True
+        elif 400 <= response.status_code < 500:
+            rules.allow_all = True
+        elif response.status_code >= 500:
+            logger.warning(f"robots.txt for {origin} returned {response.status_code}")
+            with self.lock:
+                self.stats['errors'] += 1
+            rules.disallow_all = True
+            return rules, self.error_ttl
+        else:
+            rules.parse(response.text.splitlines())
+        return rules, self.ttl
@@ -0,0 +1,98 @@
+"""Scraping engine throughput benchmark.
+
+Serves generated article pages from local fixture HTTP servers (one port per
+simulated host, each response delayed to mimic network latency) and reports
+pages/sec for the threaded and asyncio scraping engines. Per-domain rate
+limits are relaxed so the engines themselves are measured.
+
+With --parse-workers N both engines run a second time with extraction moved
+to an N-process pool, and the pool's per-stage metrics are printed.
+
+Usage: python scraper_benchmark.py [--pages N] [--hosts N] [--latency MS] [--parse-workers N]
+"""
+import time
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import web_scraper
+import async_web_scraper
+from llm_config import get_scraper_config, get_page_cache_config
+from parse_pipeline import get_parse_pipeline
+
+PARAGRAPH = "<p>Paragraph {i} of page {path}, with enough text to give the parser some work to do.</p>"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        paragraphs = ''.join(PARAGRAPH.format(i=i, path=self.path) for i in range(60))
+        body = (f"<html><head><title>{self.path}</title></head><body><nav>menu</nav>"
+                f"<article>{paragraphs}</article><footer>footer</footer></body></html>").encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_hosts(count, latency):
+    FixtureHandler.latency = latency
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+def run_engine(engine, urls):
+    start = time.perf_counter()
+    pages = engine.get_web_content(urls)
+    return len(pages), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200, help='pages to scrape per engine')
+    parser.add_argument('--hosts', type=int, default=20, help='simulated hosts (one local port each)')
+    parser.add_argument('--latency', type=float, default=50, help='server response delay in milliseconds')
+    parser.add_argument('--parse-workers', type=int, default=0, help='also run with an extraction process pool')
+    args = parser.parse_args()
+
+    # Per-page log lines would dominate the output
+    for name in ('web_scraper', 'async_web_scraper'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    # Both engines fetch the same urls, so the page cache would turn the second run into cache hits
+    get_page_cache_config()['enabled'] = False
+    config = get_scraper_config()
+    config.update({'requests_per_second': 1e6, 'burst': args.pages, 'page_deadline': 60, 'parse_workers': 0})
+    servers = start_fixture_hosts(args.hosts, args.latency / 1000)
+    urls = [f"http://127.0.0.1:{servers[i % args.hosts].server_port}/page{i}" for i in range(args.pages)]
+
+    print(f"{args.pages} pages across {args.hosts} hosts, {args.latency:.0f} ms latency")
+    print(f"threads: max_workers={config['max_workers']}; asyncio: max_in_flight={config['async_max_in_flight']}, "
+          f"{config['max_connections_per_host']} connections per host\n")
+    print(f"{'engine':<20}{'pages':>8}{'seconds':>10}{'pages/sec':>12}")
+    for parse_workers in sorted({0, args.parse_workers}):
+        config['parse_workers'] = parse_workers
+        parsing = f"+{parse_workers} procs" if parse_workers else ""
+        for name, engine in (('threads', web_scraper), ('asyncio', async_web_scraper)):
+            scraped, elapsed = run_engine(engine, urls)
+            print(f"{name + parsing:<20}{scraped:>8}{elapsed:>10.2f}{scraped / elapsed:>12.1f}")
+
+    pipeline = get_parse_pipeline()
+    if pipeline:
+        print(f"\nParse pipeline: {pipeline.get_metrics()}")
+        pipeline.shutdown()
+
+    for server in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from llm_config import get_search_config
+
+logger = logging.getLogger(__name__)
+
+class SearchCache:
+    """Two-tier search-result cache: an in-memory LRU in front of a size-bounded SQLite store.
+
+    Entries expire after the ttl of their time range (SEARCH_CONFIG["ttls"]
+    unless given) and remember how long
+    the original search took, so every hit can be credited with the latency
+    it saved.
+    """
+    def __init__(self, path="cache/search_results.sqlite3", memory_entries=256,
+                 max_disk_bytes=16 * 1024 * 1024, ttls=None):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttls = dict(ttls or get_search_config()['ttls'])
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            "key TEXT PRIMARY KEY, results TEXT, latency REAL, size INTEGER, created REAL, accessed REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS searches_accessed ON searches (accessed)")
+        self.conn.commit()
+        self.disk_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM searches").fetchone()[0]
+
+    @staticmethod
+    def make_key(query, time_range, max_results):
+        return json.dumps([' '.join(query.lower().split()), time_range or 'none', max_results])
+
+    def ttl_for(self, time_range):
+        return self.ttls.get(time_range or 'none', self.ttls.get('none', 0))
+
+    def get(self, key, time_range):
+        """Return (results, latency of the original search) or None"""
+        now = time.time()
+        ttl = self.ttl_for(time_range)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                results, latency, created = entry
+                if now - created <= ttl:
+                    self.memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return results, latency
+                del self.memory[key]
+
+            row = self.conn.execute(
+                "SELECT results, latency, created FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[2] > ttl:
+                if row is not None:
+                    self._delete(key)
+                    self.conn.commit()
+                self.stats['misses'] += 1
+                return None
+
+            results, latency, created = json.loads(row[0]), row[1], row[2]
+            self.conn.execute("UPDATE searches SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self._remember(key, results, latency, created)
+            self.stats['disk_hits'] += 1
+            return results, latency
+
+    def set(self, key, results, latency):
+        now = time.time()
+        blob = json.dumps(results)
+        size = len(blob.encode('utf-8'))
+        with self.lock:
+            self._remember(key, results, latency, now)
+            self._delete(key)
+            self.conn.execute(
+                "INSERT INTO searches (key, results, latency, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, latency, size, now, now)
+            )
+            self.disk_bytes += size
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self.memory)
+            stats['disk_bytes'] = self.disk_bytes
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _remember(self, key, results, latency, created):
+        self.memory[key] = (results, latency, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _delete(self, key):
+        row = self.conn.execute("SELECT size FROM searches WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+            self.disk_bytes -= row[0]
+
+    def _evict(self):
+        """Drop least recently used rows until the store fits in max_disk_bytes"""
+        while self.disk_bytes > self.max_disk_bytes:
+            row = self.conn.execute("SELECT key, size FROM searches ORDER BY accessed LIMIT 1").fetchone()
+            if row is None:
+                self.disk_bytes = 0
+                break
+            self.conn.execute("DELETE FROM searches WHERE key = ?", (row[0],))
+            self.memory.pop(row[0], None)
+            self.disk_bytes -= row[1]
+            self.stats['evictions'] += 1
+
+class SearchClient:
+    """DuckDuckGo text search through one long-lived DDGS client.
+
+    Results come from the cache when possible. Identical lookups that arrive
+    while a search is running wait for that search instead of sending their
+    own. Searches themselves are serialized on the shared client, which
+    DuckDuckGo's rate limiting would enforce anyway.
+    """
+    def __init__(self, cache=None, max_results=10, timeout=10):
+        self.cache = cache
+        self.max_results = max_results
+        self.timeout = timeout
+        self.ddgs = None
+        self.client_lock = threading.Lock()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.stats = {'searches': 0, 'coalesced': 0, 'errors': 0, 'search_seconds': 0.0, 'seconds_saved': 0.0}
+
+    def search(self, query, time_range='none'):
+        """Return DuckDuckGo results for query as a list of dicts (title, href, body)"""
+        key = SearchCache.make_key(query, time_range, self.max_results)
+        if self.cache:
+            cached = self.cache.get(key, time_range)
+            if cached is not None:
+                results, latency = cached
+                with self.lock:
+                    self.stats['seconds_saved'] += latency
+                return [dict(result) for result in results]
+
+        with self.lock:
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        if not owner:
+            start = time.perf_counter()
+            results, latency = future.result()
+            with self.lock:
+                self.stats['seconds_saved'] += max(0.0, latency - (time.perf_counter() - start))
+            return [dict(result) for result in results]
+
+        try:
+            results, latency = self._search(query, time_range)
+            if self.cache and results:
+                # An empty list is more often a hiccup than a real answer, so it is not kept
+                self.cache.set(key, results, latency)
+            future.set_result((results, latency))
+            return [dict(result) for result in results]
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        if self.cache:
+            stats['cache'] = self.cache.get_stats()
+        return stats
+
+    def _search(self, query, time_range):
+        from duckduckgo_search import DDGS
+        timelimit = time_range if time_range and time_range != 'none' else None
+        with self.client_lock:
+            if self.ddgs is None:
+                self.ddgs = DDGS(timeout=self.timeout)
+            start = time.perf_counter()
+            try:
+                results = list(self.ddgs.text(query, timelimit=timelimit, max_results=self.max_results))
+            except Exception:
+                # Start over with a fresh client in case the session itself went bad
+                self.ddgs = None
+                with self.lock:
+                    self.stats['errors'] += 1
+                raise
+            latency = time.perf_counter() - start
+        with self.lock:
+            self.stats['searches'] += 1
+            self.stats['search_seconds'] += latency
+        logger.info(f"Searched '{query}' (time range {time_range}) in {latency:.2f}s")
+        return results, latency
+
+_search_client = None
+_search_client_lock = threading.Lock()
+
+def get_search_client():
+    """Return the process-wide SearchClient configured by SEARCH_CONFIG"""
+    global _search_client
+    with _search_client_lock:
+        if _search_client is None:
+            config = get_search_config()
+            cache = None
+            if config.get('cache_enabled', False):
+                try:
+                    cache = SearchCache(
+                        path=config.get('path', 'cache/search_results.sqlite3'),
+                        memory_entries=config.get('memory_entries', 256),
+                        max_disk_bytes=config.get('max_disk_bytes', 16 * 1024 * 1024),
+                        ttls=config.get('ttls')
+                    )
+                except Exception as e:
+                    logger.error(f"Error opening search cache: {str(e)}")
+            _search_client = SearchClient(
+                cache=cache,
+                max_results=config.get('max_results', 10),
+                timeout=config.get('timeout', 10)
+            )
+        return _search_client
+
+def get_search_stats():
+    """Stats of the process-wide SearchClient, or None if no search has created it yet"""
+    with _search_client_lock:
+        client = _search_client
+    return client.get_stats() if client else None
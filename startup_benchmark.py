@@ -0,0 +1,80 @@
+"""Cold-start import benchmark.
+
+Runs `python -X importtime` in fresh interpreters and reports how long the
+application modules take to import, which backend SDKs got loaded, and what
+importing every SDK eagerly (as llm_wrapper used to) would cost on top.
+
+Usage: python startup_benchmark.py [--runs N]
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+APP_MODULES = ['llm_wrapper', 'research_manager', 'Web-LLM']
+BACKEND_SDKS = ['llama_cpp', 'openai', 'anthropic', 'aiohttp', 'tiktoken']
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+def run_importtime(statement):
+    """Import in a fresh interpreter and return {top-level module: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            # Only modules imported directly by the statement have a single-space indent
+            if len(indent) == 1:
+                timings[name] = timings.get(name, 0) + cumulative
+    return timings
+
+def import_statement(module, sdks=()):
+    modules = list(sdks) + [module]
+    return '; '.join(f"__import__('importlib').import_module('{name}')" for name in modules)
+
+def available_sdks():
+    available = []
+    for sdk in BACKEND_SDKS:
+        probe = subprocess.run([sys.executable, '-c', f'import {sdk}'], capture_output=True)
+        if probe.returncode == 0:
+            available.append(sdk)
+    return available
+
+def benchmark(module, runs, sdks=()):
+    totals = []
+    loaded = set()
+    for _ in range(runs):
+        timings = run_importtime(import_statement(module, sdks))
+        totals.append(sum(timings.values()))
+        loaded.update(name for name in timings if name in BACKEND_SDKS)
+    return statistics.median(totals) / 1000, sorted(loaded)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per measurement')
+    args = parser.parse_args()
+
+    sdks = available_sdks()
+    print(f"Installed backend SDKs: {', '.join(sdks) or 'none'}")
+    print(f"Median of {args.runs} cold imports\n")
+    print(f"{'module':<20}{'lazy (ms)':>12}{'eager (ms)':>12}{'saved (ms)':>12}  SDKs loaded lazily")
+    for module in APP_MODULES:
+        try:
+            lazy_ms, loaded = benchmark(module, args.runs)
+            eager_ms, _ = benchmark(module, args.runs, sdks)
+        except RuntimeError as e:
+            print(f"{module:<20}failed: {e}")
+            continue
+        print(f"{module:<20}{lazy_ms:>12.1f}{eager_ms:>12.1f}{eager_ms - lazy_ms:>12.1f}  {', '.join(loaded) or 'none'}")
+
+if __name__ == "__main__":
+    main()
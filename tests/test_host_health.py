@@ -0,0 +1,30 @@
+import pytest
+from host_health import HostHealth
+from web_scraper import WebScraper
+
+DOMAIN = 'example.com'
+
+def open_circuit_ready_for_trial():
+    health = HostHealth(failure_threshold=1, cooldown=0)
+    assert health.record_failure(DOMAIN)
+    return health
+
+def test_allow_marks_the_half_open_probe_as_trial():
+    health = open_circuit_ready_for_trial()
+    assert health.allow(DOMAIN) == HostHealth.TRIAL
+    assert not health.allow(DOMAIN)
+    health.release_trial(DOMAIN)
+    assert health.allow(DOMAIN) == HostHealth.TRIAL
+
+def test_fetch_page_releases_trial_on_unexpected_error():
+    health = open_circuit_ready_for_trial()
+    scraper = WebScraper(respect_robots_txt=False, health=health)
+
+    def broken_get(*args, **kwargs):
+        raise ValueError("decoder blew up")
+    scraper.session.get = broken_get
+
+    with pytest.raises(ValueError):
+        scraper.fetch_page(f"https://{DOMAIN}/page")
+    assert not health.hosts[DOMAIN]['trial_in_flight']
+    assert health.allow(DOMAIN) == HostHealth.TRIAL
@@ -0,0 +1,12 @@
+from url_index import canonicalize_url
+
+def test_equivalent_spellings_share_one_canonical_url():
+    assert canonicalize_url("HTTP://Example.com:80/a/?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+    assert canonicalize_url("https://example.com:443/") == "https://example.com/"
+
+def test_non_default_port_is_kept():
+    assert canonicalize_url("https://example.com:8443/a") == "https://example.com:8443/a"
+
+def test_malformed_port_does_not_raise():
+    assert canonicalize_url("http://X.com:99999/a/") == "https://x.com:99999/a"
+    assert canonicalize_url("http://x.com:abc/") == "https://x.com:abc/"
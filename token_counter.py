@@ -0,0 +1,53 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TokenCounter:
+    """Counts tokens with the tokenizer that matches the active LLM backend.
+
+    llama_cpp uses the loaded model's own tokenizer, OpenAI models use their
+    tiktoken BPE encoding, and other backends use a generic BPE encoding when
+    tiktoken is installed or a word/character heuristic otherwise.
+    """
+    def __init__(self, llm_wrapper):
+        self.llm_type = llm_wrapper.llm_type
+        self.method, self._encode = self._select_tokenizer(llm_wrapper)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        try:
+            return self._encode(text)
+        except Exception as e:
+            logger.warning(f"Tokenizer '{self.method}' failed, using heuristic: {str(e)}")
+            return self._estimate(text)
+
+    def _select_tokenizer(self, llm_wrapper):
+        if self.llm_type == 'llama_cpp':
+            model = llm_wrapper.llm
+            return 'llama_cpp', lambda text: len(model.tokenize(text.encode('utf-8'), add_bos=False))
+
+        try:
+            import tiktoken
+        except ImportError:
+            return 'heuristic', self._estimate
+
+        try:
+            if self.llm_type == 'openai':
+                try:
+                    encoding = tiktoken.encoding_for_model(llm_wrapper.model_name)
+                except KeyError:
+                    encoding = tiktoken.get_encoding('o200k_base')
+            else:
+                # No local tokenizer for this backend; a BPE count is still far closer than word counts
+                encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception as e:
+            # tiktoken downloads its encodings on first use, which fails offline
+            logger.warning(f"Could not load tiktoken encoding, using heuristic: {str(e)}")
+            return 'heuristic', self._estimate
+
+        return f'tiktoken:{encoding.name}', lambda text: len(encoding.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        return int(max(len(text.split()) * 1.3, len(text) / 4))
@@ -0,0 +1,121 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', 'ref_src'}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonicalize_url(url):
+    """Reduce a url to one spelling per page.
+
+    http and https map to https, host and scheme are lowercased, default
+    ports, fragments, tracking parameters and trailing slashes are dropped,
+    and the remaining query parameters are sorted. A url with an unparseable
+    port keeps its netloc as written (lowercased).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        # Out of range or not a number (e.g. "x:99999", "x:abc"); nothing to normalize
+        port = None
+        host = parts.netloc.lower().rsplit('@', 1)[-1]
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        netloc = f"{host}:{port}"
+    if parts.username:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(params)), ''))
+
+class SeenUrlStore:
+    """Persistent record of pages already researched, shared across sessions.
+
+    URLs are stored canonicalized in SQLite under a scope (the research topic,
+    or one global scope). Positive answers are kept in a bounded in-memory LRU
+    so repeated checks during a session do not touch the database.
+    """
+    def __init__(self, path="cache/seen_urls.sqlite3", memory_entries=10000):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'added': 0}
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_urls ("
+            "scope TEXT, url TEXT, source TEXT, first_seen REAL, PRIMARY KEY (scope, url))"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_scope(topic):
+        return ' '.join(topic.lower().split()) if topic else ''
+
+    def seen(self, url, scope=''):
+        key = (scope, canonicalize_url(url))
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return True
+            row = self.conn.execute("SELECT 1 FROM seen_urls WHERE scope = ? AND url = ?", key).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return False
+            self.stats['disk_hits'] += 1
+            self._remember(key)
+            return True
+
+    def add(self, url, scope='', source=''):
+        """Record url as researched; source notes where it was used (e.g. the session document)"""
+        key = (scope, canonicalize_url(url))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO seen_urls (scope, url, source, first_seen) VALUES (?, ?, ?, ?)",
+                (*key, source, time.time())
+            )
+            self.conn.commit()
+            self._remember(key)
+            self.stats['added'] += 1
+
+    def count(self, scope=''):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen_urls WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self.memory)
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _remember(self, key):
+        self.memory[key] = True
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
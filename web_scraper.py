@@ -1,140 +1,471 @@
 import requests
-from bs4 import BeautifulSoup
-from urllib.robotparser import RobotFileParser
-from urllib.parse import urlparse, urljoin
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from llm_config import get_scraper_config, get_page_cache_config
+from rate_limiter import DomainRateLimiter
+from page_cache import PageCache
+from robots_cache import RobotsCache
+from parse_pipeline import get_parse_pipeline
+from host_health import HostHealth
+from html_extractors import get_extractor, resolve_extractor, MAX_CONTENT_CHARS, MAX_PASSAGE_TEXT_CHARS
+from passage_ranker import select_passages
+from page_stream import PageReader, is_accepted_content_type, CHUNK_BYTES
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@dataclass
+class PendingParse:
+    """A downloaded page handed to the parse pipeline; job resolves to (data, seconds)"""
+    job: Future
+    fetched: dict
+
 class WebScraper:
     def __init__(self, user_agent="WebLLMAssistant/1.0 (+https://github.com/YourUsername/Web-LLM-Assistant-Llama-cpp)",
-                 rate_limit=1, timeout=10, max_retries=3):
+                 rate_limit=1, timeout=10, max_retries=3, pool_hosts=20, max_connections_per_host=4,
+                 burst=1, min_rate=0.05, page_cache=None, extractor='html.parser',
+                 max_page_bytes=2 * 1024 * 1024, stop_when_content_filled=True,
+                 respect_robots_txt=True, robots_ttl=24 * 3600, health=None,
+                 rank_passages=True, content_budget_chars=MAX_CONTENT_CHARS, content_budget_tokens=None):
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": user_agent})
-        self.robot_parser = RobotFileParser()
+        # Keep-alive pools for up to pool_hosts hosts; pool_block caps connections per host
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=max_connections_per_host, pool_block=True)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.robots = RobotsCache(self.session, user_agent, ttl=robots_ttl) if respect_robots_txt else None
         self.rate_limit = rate_limit
         self.timeout = timeout
         self.max_retries = max_retries
-        self.last_request_time = {}
+        # rate_limit is the minimum spacing in seconds between requests to one domain
+        self.rate_limiter = DomainRateLimiter(rate=1 / rate_limit, burst=burst, min_rate=min_rate)
+        self.health = health or HostHealth()
+        self.page_cache = page_cache
+        self.extractor = get_extractor(extractor)
+        self.max_page_bytes = max_page_bytes
+        # Stop downloading once the page holds as much paragraph text as extraction keeps;
+        # ranking needs the whole passage window rather than the leading content
+        self.rank_passages = rank_passages
+        self.content_budget_chars = content_budget_chars
+        self.content_budget_tokens = content_budget_tokens
+        text_budget = MAX_PASSAGE_TEXT_CHARS if rank_passages else MAX_CONTENT_CHARS
+        self.content_budget = text_budget if stop_when_content_filled else None
+        self.fetch_stats = {
+            'fetches': 0,
+            'bytes_read': 0,
+            'bytes_saved': 0,
+            'stopped_early': 0,
+            'truncated': 0,
+            'rejected_content_type': 0
+        }
+        self.fetch_stats_lock = threading.Lock()
 
     def can_fetch(self, url):
-        # parsed_url = urlparse(url)
-        # robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        # self.robot_parser.set_url(robots_url)
-        # try:
-        #     self.robot_parser.read()
-        #     return self.robot_parser.can_fetch(self.session.headers["User-Agent"], url)
-        # except Exception as e:
-        #     logger.warning(f"Error reading robots.txt for {url}: {e}")
-            return True  # ignore robots.txt
-
-    def respect_rate_limit(self, url):
-        domain = urlparse(url).netloc
-        current_time = time.time()
-        if domain in self.last_request_time:
-            time_since_last_request = current_time - self.last_request_time[domain]
-            if time_since_last_request < self.rate_limit:
-                time.sleep(self.rate_limit - time_since_last_request)
-        self.last_request_time[domain] = time.time()
-
-    def scrape_page(self, url):
+        if not self.robots:
+            return True
+        return self.robots.can_fetch(url)
+
+    def get_pool_stats(self):
+        """Return per-host connection pool statistics for the shared session"""
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools[key]
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                'requests': pool.num_requests,
+                'new_connections': pool.num_connections,
+                # The pool queue is padded with None placeholders for connections not yet opened
+                'idle_connections': sum(1 for conn in list(pool.pool.queue) if conn) if pool.pool else 0
+            }
+        return {
+            'hosts': hosts,
+            'requests': sum(host['requests'] for host in hosts.values()),
+            'new_connections': sum(host['new_connections'] for host in hosts.values())
+        }
+
+    def respect_rate_limit(self, url, deadline=None):
+        """Block until the url's domain may be requested again; False if that would pass the deadline"""
+        return self.rate_limiter.acquire(urlparse(url).netloc, deadline)
+
+    def scrape_page(self, url, deadline=None, token_acquired=False, cached=None, looked_up=False):
+        """Scrape a page, giving up once the optional absolute deadline (time.time()) passes.
+
+        token_acquired means the caller already took a rate-limit token for the first attempt.
+        """
+        fetched = self.fetch_page(url, deadline, token_acquired, cached, looked_up)
+        if fetched is None or 'data' in fetched:
+            return fetched and fetched['data']
+        data = self.extract_content(fetched['html'], url)
+        self.cache_page(url, data, fetched['headers'], stale=fetched['stale'], reader=fetched['reader'])
+        return data
+
+    def fetch_page(self, url, deadline=None, token_acquired=False, cached=None, looked_up=False):
+        """Fetch a page without extracting it.
+
+        Returns {'data': ...} when the page cache answered, {'html', 'headers', 'stale', 'reader'}
+        for a downloaded page that still needs extraction, or None on failure. A caller that
+        has already looked the url up in the page cache passes the entry with looked_up=True.
+        """
         if not self.can_fetch(url):
             logger.info(f"Robots.txt disallows scraping: {url}")
             return None
 
-        for attempt in range(self.max_retries):
-            try:
-                self.respect_rate_limit(url)
-                response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                return self.extract_content(response.text, url)
-            except requests.RequestException as e:
-                logger.warning(f"Error scraping {url} (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if attempt == self.max_retries - 1:
-                    logger.error(f"Failed to scrape {url} after {self.max_retries} attempts")
+        if not looked_up:
+            cached = self.page_cache.lookup(url) if self.page_cache else None
+        if cached and cached['fresh']:
+            return {'data': cached['data']}
+        headers = PageCache.conditional_headers(cached)
+
+        domain = urlparse(url).netloc
+        trial = False
+        try:
+            for attempt in range(self.max_retries):
+                permit = self.health.allow(domain)
+                if not permit:
+                    logger.info(f"Skipping {url}: {domain} is failing and its circuit is open")
                     return None
-                time.sleep(2 ** attempt)  # Exponential backoff
+                trial = trial or permit == HostHealth.TRIAL
+                if not (token_acquired and attempt == 0) and not self.respect_rate_limit(url, deadline):
+                    logger.warning(f"Deadline reached waiting for the rate limit on {url}")
+                    return None
+                timeout = self.health.timeout_for(domain, self.timeout)
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.time())
+                    if timeout <= 0:
+                        logger.warning(f"Deadline reached before scraping {url}")
+                        return None
+                try:
+                    start = time.time()
+                    with self.session.get(url, timeout=timeout, headers=headers, stream=True) as response:
+                        self.record_response(domain, response.status_code, response.headers, time.time() - start)
+                        response.raise_for_status()
+                        if cached and response.status_code == 304:
+                            self.page_cache.revalidated(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                            return {'data': cached['data']}
+                        reader = self.read_body(response, url, deadline)
+                    if reader is None:
+                        return None
+                    return {'html': reader.text(), 'headers': response.headers, 'stale': cached is not None,
+                            'reader': reader}
+                except requests.RequestException as e:
+                    status = e.response.status_code if e.response is not None else None
+                    if not self.should_retry(url, domain, status, e):
+                        return None
+                    logger.warning(f"Error scraping {url} (attempt {attempt + 1}/{self.max_retries}): {e}")
+                    backoff = 2 ** attempt  # Exponential backoff
+                    if attempt == self.max_retries - 1 or (deadline is not None and time.time() + backoff >= deadline):
+                        logger.error(f"Failed to scrape {url} after {attempt + 1} attempts")
+                        return None
+                    time.sleep(backoff)
+        finally:
+            if trial:
+                # However the probe ended (including errors reading or decoding the body),
+                # the domain must not be left waiting on a trial that never reports back
+                self.health.release_trial(domain)
 
-    def extract_content(self, html, url):
-        soup = BeautifulSoup(html, 'html.parser')
+    def record_response(self, domain, status, headers, latency):
+        """Feed a response's status and time-to-headers into the rate limiter and host health"""
+        if status in (429, 503):
+            self.rate_limiter.record_throttled(domain, headers.get('Retry-After'))
+        else:
+            self.rate_limiter.record_success(domain)
+        if status < 500 and status != 429:
+            # Any answer short of a server error shows the host is up, including a 404
+            self.health.record_success(domain, latency)
+        elif status == 429:
+            self.health.release_trial(domain)
 
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "footer", "header"]):
-            element.decompose()
+    def should_retry(self, url, domain, status, error):
+        """Decide whether a failed attempt is worth repeating, recording host failures on the way"""
+        if status is not None and 400 <= status < 500 and status != 429:
+            logger.warning(f"Error scraping {url}: {error}")
+            return False
+        if status is None or status >= 500:
+            if self.health.record_failure(domain):
+                logger.warning(f"Giving up on {url}: {domain} keeps failing, skipping it for a while")
+                return False
+        return True
 
-        # Extract title
-        title = soup.title.string if soup.title else ""
+    def read_body(self, response, url, deadline=None):
+        """Stream the body up to the byte ceiling, stopping once enough content has arrived.
 
-        # Try to find main content
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+        Returns the PageReader holding the body, or None for content types that
+        cannot be extracted, without reading the body.
+        """
+        content_type = response.headers.get('Content-Type', '')
+        if not is_accepted_content_type(content_type):
+            self.reject_content_type(url, content_type)
+            return None
+        reader = PageReader(content_type, self.max_page_bytes, self.content_budget)
+        for chunk in response.iter_content(chunk_size=CHUNK_BYTES):
+            if reader.feed(chunk):
+                break
+            if deadline is not None and time.time() >= deadline:
+                # Extract what has arrived rather than losing the page
+                reader.truncated = True
+                break
+        # raw.tell() counts bytes on the wire, before any Content-Encoding is undone
+        self.record_fetch(url, reader, response.headers, response.raw.tell())
+        return reader
 
-        if main_content:
-            paragraphs = main_content.find_all('p')
-        else:
-            paragraphs = soup.find_all('p')
+    def reject_content_type(self, url, content_type):
+        logger.info(f"Skipping {url}: unsupported content type {content_type}")
+        with self.fetch_stats_lock:
+            self.fetch_stats['rejected_content_type'] += 1
 
-        # Extract text from paragraphs
-        text = ' '.join([p.get_text().strip() for p in paragraphs])
+    def record_fetch(self, url, reader, headers, wire_bytes=None):
+        """Account for one streamed body; bytes saved are known when the server sent Content-Length"""
+        if wire_bytes is None and not headers.get('Content-Encoding'):
+            wire_bytes = reader.bytes_read
+        bytes_saved = 0
+        content_length = headers.get('Content-Length', '')
+        if (reader.stopped_early or reader.truncated) and content_length.isdigit() and wire_bytes is not None:
+            bytes_saved = max(0, int(content_length) - wire_bytes)
+        with self.fetch_stats_lock:
+            self.fetch_stats['fetches'] += 1
+            self.fetch_stats['bytes_read'] += wire_bytes if wire_bytes is not None else reader.bytes_read
+            self.fetch_stats['bytes_saved'] += bytes_saved
+            self.fetch_stats['stopped_early'] += reader.stopped_early
+            self.fetch_stats['truncated'] += reader.truncated
+        if reader.stopped_early or reader.truncated:
+            reason = "content budget filled" if reader.stopped_early else "byte ceiling or deadline reached"
+            logger.info(f"Stopped reading {url} after {reader.bytes_read} bytes ({reason}, {bytes_saved} bytes saved)")
 
-        # If no paragraphs found, get all text
-        if not text:
-            text = soup.get_text()
+    def get_fetch_stats(self):
+        with self.fetch_stats_lock:
+            return dict(self.fetch_stats)
 
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+    def cache_page(self, url, data, headers, stale=False, reader=None):
+        """Store an extracted page with its validators unless the response forbids storing it.
 
-        # Extract and resolve links
-        links = [urljoin(url, a['href']) for a in soup.find_all('a', href=True)]
+        A body cut off by the byte ceiling or deadline is not stored. One that stopped
+        once the content budget filled is stored without validators: it is served
+        until ttl, then fetched in full instead of being revalidated by a 304.
+        """
+        if not self.page_cache or 'no-store' in headers.get('Cache-Control', ''):
+            return
+        if reader is not None and reader.truncated:
+            return
+        if reader is not None and reader.stopped_early:
+            self.page_cache.store(url, data, stale=stale)
+            return
+        self.page_cache.store(url, data, headers.get('ETag'), headers.get('Last-Modified'), stale=stale)
 
-        return {
-            "url": url,
-            "title": title,
-            "content": text[:2400],  # Limit to first 2400 characters
-            "links": links[:10]  # Limit to first 10 links
-        }
+    def get_page_cache_stats(self):
+        return self.page_cache.get_stats() if self.page_cache else {}
 
-def scrape_multiple_pages(urls, max_workers=5):
-    scraper = WebScraper()
-    results = {}
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(scraper.scrape_page, url): url for url in urls}
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            try:
-                data = future.result()
-                if data:
-                    results[url] = data
-                    logger.info(f"Successfully scraped: {url}")
+    def extract_content(self, html, url):
+        return self.extractor(html, url)
+
+    def focus_content(self, data, query, count_tokens=None):
+        """Replace a page's leading content with its passages that best match query, within the budget.
+
+        Cached pages keep every passage, so the same page can be focused on other queries later.
+        """
+        if not (self.rank_passages and query and data.get('passages')):
+            return data
+        content = select_passages(
+            data['passages'], query, self.content_budget_chars, self.content_budget_tokens, count_tokens
+        )
+        return {**data, 'content': content} if content else data
+
+_shared_scraper = None
+_shared_scraper_lock = threading.Lock()
+
+def get_shared_scraper():
+    """Return the process-wide WebScraper so connections and rate-limit state survive between searches"""
+    global _shared_scraper
+    with _shared_scraper_lock:
+        if _shared_scraper is None:
+            config = get_scraper_config()
+            cache_config = get_page_cache_config()
+            page_cache = None
+            if cache_config.get('enabled', False):
+                page_cache = PageCache(
+                    path=cache_config.get('path', 'cache/pages.sqlite3'),
+                    max_disk_bytes=cache_config.get('max_disk_bytes', 128 * 1024 * 1024),
+                    ttl=cache_config.get('ttl', 24 * 3600),
+                    namespace=resolve_extractor(config.get('extractor', 'html.parser'))
+                )
+            _shared_scraper = WebScraper(
+                rate_limit=1 / config.get('requests_per_second', 1.0),
+                pool_hosts=config.get('pool_hosts', 20),
+                max_connections_per_host=config.get('max_connections_per_host', 4),
+                burst=config.get('burst', 1),
+                min_rate=config.get('min_requests_per_second', 0.05),
+                page_cache=page_cache,
+                extractor=config.get('extractor', 'html.parser'),
+                max_page_bytes=config.get('max_page_bytes', 2 * 1024 * 1024),
+                stop_when_content_filled=config.get('stop_when_content_filled', True),
+                respect_robots_txt=config.get('respect_robots_txt', True),
+                robots_ttl=config.get('robots_ttl', 24 * 3600),
+                health=HostHealth(
+                    failure_threshold=config.get('circuit_failure_threshold', 3),
+                    cooldown=config.get('circuit_cooldown', 300)
+                ),
+                rank_passages=config.get('rank_passages', True),
+                content_budget_chars=config.get('content_budget_chars', MAX_CONTENT_CHARS),
+                content_budget_tokens=config.get('content_budget_tokens')
+            )
+        return _shared_scraper
+
+def iter_scraped_pages(urls, max_workers=None, page_deadline=None, scrape_deadline=None):
+    """Scrape urls concurrently and yield (url, data) pairs as each page completes.
+
+    A url is only handed to a worker once its domain has a rate-limit token, so
+    workers move on to other domains instead of sleeping. Every page gets
+    page_deadline seconds from the moment a worker picks it up, covering all
+    retries, and a url that cannot get a token within page_deadline is dropped.
+    The whole call stops after scrape_deadline seconds with whatever has been
+    scraped by then. Domains whose circuit is open are skipped up front.
+    With parse_workers configured, fetch threads only download and hand the
+    HTML to the process pool; extraction results are collected here.
+    """
+    config = get_scraper_config()
+    max_workers = max_workers or config.get('max_workers', 5)
+    page_deadline = page_deadline or config.get('page_deadline', 20)
+    scrape_deadline = time.time() + (scrape_deadline or config.get('scrape_deadline', 30))
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+
+    scraper = get_shared_scraper()
+    pipeline = get_parse_pipeline()
+
+    def scrape(url, cached):
+        deadline = min(time.time() + page_deadline, scrape_deadline)
+        if not pipeline:
+            return scraper.scrape_page(url, deadline=deadline, token_acquired=True, cached=cached, looked_up=True)
+        start = time.perf_counter()
+        fetched = scraper.fetch_page(url, deadline=deadline, token_acquired=True, cached=cached, looked_up=True)
+        pipeline.record_fetch(time.perf_counter() - start)
+        if fetched is None or 'data' in fetched:
+            return fetched and fetched['data']
+        # Blocks while the parse queue is full, which holds this fetcher back
+        return PendingParse(job=pipeline.submit(fetched.pop('html'), url), fetched=fetched)
+
+    queue_deadline = min(time.time() + page_deadline, scrape_deadline)
+    pending = deque(urls)
+    # Page cache entries, looked up once per url so freshness cannot change between
+    # deciding to skip the rate-limit token and the fetch itself
+    entries = {}
+    fetching = {}
+    parsing = {}
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    try:
+        while pending or fetching or parsing:
+            next_ready = None
+            for _ in range(len(pending)):
+                if len(fetching) >= max_workers:
+                    break
+                url = pending.popleft()
+                domain = urlparse(url).netloc
+                if url not in entries:
+                    entries[url] = scraper.page_cache.lookup(url) if scraper.page_cache else None
+                # Fresh cache hits make no request, so they do not wait for a token
+                if entries[url] and entries[url]['fresh']:
+                    delay = 0.0
+                elif not scraper.health.is_healthy(domain):
+                    logger.warning(f"Skipping {url}: {domain} is failing and its circuit is open")
+                    continue
                 else:
-                    logger.warning(f"Failed to scrape: {url}")
-            except Exception as exc:
-                logger.error(f"{url} generated an exception: {exc}")
+                    delay = scraper.rate_limiter.try_acquire(domain)
+                if delay == 0.0:
+                    fetching[executor.submit(scrape, url, entries[url])] = url
+                elif time.time() + delay > queue_deadline:
+                    logger.warning(f"Rate limit would delay {url} past the deadline; skipping")
+                else:
+                    pending.append(url)
+                    next_ready = delay if next_ready is None else min(next_ready, delay)
+
+            remaining = scrape_deadline - time.time()
+            if remaining <= 0:
+                logger.warning(f"Scrape deadline reached with {len(pending) + len(fetching) + len(parsing)} pages unfinished")
+                break
+            if next_ready is not None:
+                next_ready = min(next_ready, remaining)
+            if not fetching and not parsing:
+                if next_ready is not None:
+                    time.sleep(next_ready)
+                continue
+
+            done, _ = wait(list(fetching) + list(parsing), timeout=next_ready or remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    if future in fetching:
+                        url = fetching.pop(future)
+                        data = future.result()
+                        if isinstance(data, PendingParse):
+                            parsing[data.job] = (url, data.fetched)
+                            continue
+                    else:
+                        url, fetched = parsing.pop(future)
+                        data = future.result()[0]
+                        scraper.cache_page(url, data, fetched['headers'], stale=fetched['stale'], reader=fetched['reader'])
+                    if data:
+                        logger.info(f"Successfully scraped: {url}")
+                        yield url, data
+                    else:
+                        logger.warning(f"Failed to scrape: {url}")
+                except Exception as exc:
+                    logger.error(f"{url} generated an exception: {exc}")
+    finally:
+        # Do not wait for stragglers; they stop at their own deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+        for job in parsing:
+            job.cancel()
+
+def scrape_multiple_pages(urls, max_workers=None, page_deadline=None):
+    return dict(iter_scraped_pages(urls, max_workers=max_workers, page_deadline=page_deadline))
+
+def iter_web_pages(urls, page_deadline=None, query=None, count_tokens=None):
+    """Yield (url, page) pairs with the full extracted page on the configured engine.
 
-    return results
+    With a query, each page's content is made of its passages that best match it;
+    count_tokens measures them against the token budget.
+    """
+    if get_scraper_config().get('engine', 'threads') == 'asyncio':
+        import async_web_scraper
+        pages = async_web_scraper.iter_scraped_pages(urls, page_deadline=page_deadline)
+    else:
+        pages = iter_scraped_pages(urls, page_deadline=page_deadline)
+    scraper = get_shared_scraper()
+    for url, data in pages:
+        yield url, scraper.focus_content(data, query, count_tokens)
+
+def get_web_pages(urls, page_deadline=None, query=None):
+    return dict(iter_web_pages(urls, page_deadline=page_deadline, query=query))
+
+def iter_web_content(urls, page_deadline=None, query=None):
+    """Yield (url, content) pairs for urls as soon as each page has been scraped"""
+    for url, data in iter_web_pages(urls, page_deadline=page_deadline, query=query):
+        yield url, data['content']
 
 # Function to integrate with your main system
-def get_web_content(urls):
-    scraped_data = scrape_multiple_pages(urls)
-    return {url: data['content'] for url, data in scraped_data.items() if data}
+def get_web_content(urls, page_deadline=None, query=None):
+    return dict(iter_web_content(urls, page_deadline=page_deadline, query=query))
 
 # Standalone can_fetch function
 def can_fetch(url):
-    # parsed_url = urlparse(url)
-    # robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-    # rp = RobotFileParser()
-    # rp.set_url(robots_url)
-    # try:
-    #     rp.read()
-    #     return rp.can_fetch("*", url)
-    # except Exception as e:
-    #     logger.warning(f"Error reading robots.txt for {url}: {e}")
-        return True  # ignore robots.xt
+    """Check robots.txt through the shared scraper's per-domain cache"""
+    return get_shared_scraper().can_fetch(url)
+
+def is_healthy(url):
+    """False while the url's domain is being skipped after repeated failures"""
+    return get_shared_scraper().health.is_healthy(urlparse(url).netloc)
+
+def prefetch_robots(urls):
+    """Warm the robots.txt cache for urls in the background"""
+    scraper = get_shared_scraper()
+    if scraper.robots:
+        scraper.robots.prefetch(urls)
 
 if __name__ == "__main__":
     test_urls = [